@@ -22,6 +22,15 @@ class AudioCore:
         self.current_test_name = "unknown_test"
         self.record_duration = 0
         self.reference_text = None  # НОВОЕ: сохраняем фразу для проверки
+        self.recording_done_event = threading.Event()  # Устанавливается после остановки и сохранения записи
+        
+        # Кольцевой буфер уровней: каждый callback пишет только в свою колонку,
+        # GUI читает последнюю ячейку без блокировки
+        self._level_channels = {'outside': 0, 'inside': 1}
+        self._level_ring = np.zeros((256, 2), dtype=np.float32)
+        self._level_heads = [0, 0]
+        self._level_scratch = np.empty((2, self.chunk_size), dtype=np.float32)
+        self.level_update_event = threading.Event()  # Устанавливается callback'ом при появлении нового уровня
         self._create_recordings_folder()
         
     def _create_recordings_folder(self):
@@ -116,6 +125,19 @@ class AudioCore:
         if self.is_recording:
             try:
                 audio_array = np.frombuffer(in_data, dtype=np.int16)
+                
+                # RMS блока -> кольцевой буфер уровней (вне блокировки)
+                col = self._level_channels[channel]
+                n = audio_array.size
+                if n > 0:
+                    x = self._level_scratch[col, :n] if n <= self.chunk_size else np.empty(n, dtype=np.float32)
+                    np.multiply(audio_array, 1.0 / 32768.0, out=x, casting='unsafe')
+                    rms = float(np.sqrt(np.dot(x, x) / x.size))
+                    head = self._level_heads[col]
+                    self._level_ring[head % len(self._level_ring), col] = min(rms, 1.0)
+                    self._level_heads[col] = head + 1
+                    self.level_update_event.set()
+                
                 with self.lock:
                     self.audio_data[channel].extend(audio_array)
             except Exception as e:
@@ -136,6 +158,9 @@ class AudioCore:
         with self.lock:
             self.audio_data = {'outside': [], 'inside': []}
         
+        self._level_ring.fill(0.0)
+        self.level_update_event.clear()
+        self.recording_done_event.clear()
         self.current_test_name = test_name or datetime.now().strftime("test_%Y%m%d_%H%M%S")
         self.record_duration = duration  # Сохраняем длительность
         self.is_recording = True
@@ -242,6 +267,7 @@ class AudioCore:
             if saved_files:
                 print(f"   Файлы: {saved_files}")
         
+        self.recording_done_event.set()
         return saved_files
     
     def _save_recordings(self):
@@ -249,13 +275,16 @@ class AudioCore:
         saved_files = {}
         
         with self.lock:
-            for channel in ['outside', 'inside']:
-                if len(self.audio_data[channel]) > 0:
+            for channel in ('outside', 'inside'):
+                # Данные канала берутся из словаря один раз на итерацию
+                channel_data = self.audio_data[channel]
+                if len(channel_data) > 0:
                     filename = f"{self.current_test_name}_{channel}.wav"
                     filepath = os.path.join(self.recordings_folder, filename)
                     
                     try:
-                        audio_array = np.array(self.audio_data[channel], dtype=np.int16)
+                        audio_array = np.array(channel_data, dtype=np.int16)
+                        samples = len(audio_array)
                         
                         with wave.open(filepath, 'wb') as wav_file:
                             wav_file.setnchannels(1)
@@ -266,8 +295,8 @@ class AudioCore:
                         saved_files[channel] = {
                             'filename': filename,
                             'filepath': filepath,
-                            'samples': len(audio_array),
-                            'duration': len(audio_array) / self.sample_rate
+                            'samples': samples,
+                            'duration': samples / self.sample_rate
                         }
                         print(f"✅ Сохранен {channel}: {filename}")
                         
@@ -289,7 +318,7 @@ class AudioCore:
             'test_name': self.current_test_name,
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'sample_rate': self.sample_rate,
-            'duration': saved_files.get('outside', {}).get('duration', 0),
+            'duration': (saved_files.get('outside') or {}).get('duration', 0),
             'files': saved_files,
             'analysis_ready': True,
             'reference_text': self.reference_text,  # НОВОЕ: сохраняем фразу для проверки
@@ -307,19 +336,15 @@ class AudioCore:
             print(f"❌ Ошибка сохранения метаданных: {e}")
     
     def get_audio_levels(self):
-        """Получить текущие уровни громкости"""
-        levels = {'outside': 0.0, 'inside': 0.0}
+        """Получить текущие уровни громкости (последний блок из кольцевого буфера)"""
+        ring = self._level_ring
+        size = len(ring)
+        outside_head, inside_head = self._level_heads
         
-        with self.lock:
-            for channel in ['outside', 'inside']:
-                if len(self.audio_data[channel]) > 0:
-                    recent_samples = self.audio_data[channel][-self.chunk_size:]
-                    if len(recent_samples) > 0:
-                        audio_array = np.array(recent_samples, dtype=np.float32)
-                        rms = np.sqrt(np.mean(np.square(audio_array)))
-                        levels[channel] = min(rms / 32768.0, 1.0)
-        
-        return levels
+        return {
+            'outside': float(ring[(outside_head - 1) % size, 0]),
+            'inside': float(ring[(inside_head - 1) % size, 1])
+        }
     
     def get_recording_stats(self):
         """Получить статистику записи"""
@@ -1,7 +1,9 @@
 ﻿# -*- coding: utf-8 -*-
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, scrolledtext, simpledialog
+from tkinter import font as tkfont
 import threading
+import queue
 import time
 import sys
 import os
@@ -9,11 +11,23 @@ import json
 import webbrowser
 from datetime import datetime, timedelta
 import csv
+import io
 import subprocess
 import random
 import math
 import difflib
 import re
+import string
+import logging
+from logging.handlers import RotatingFileHandler
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
+from collections import ChainMap
+from operator import itemgetter
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields
+from typing import Optional, List, Dict
 
 # Функция для динамического импорта модулей
 def import_audio_core():
@@ -27,6 +41,8 @@ def import_audio_core():
         class AudioCoreStub:
             def __init__(self):
                 self.is_recording = False
+                self.recording_done_event = threading.Event()
+                self.level_update_event = threading.Event()
                 print("⚠️ Используется заглушка AudioCore")
             
             def get_audio_devices(self):
@@ -132,13 +148,20 @@ AudioCore = import_audio_core()
 EnhancedSoundIsolationAnalyzer = import_ai_analyzer()
 MultiEngineSpeechRecognizer, RecognitionEngine, SPEECH_RECOGNITION_AVAILABLE = import_speech_recognizer()
 
-# Пытаемся импортировать dataset_generator, если нет - выводим предупреждение
-try:
-    from dataset_generator import TestDatasetGenerator, AcousticCondition, create_diploma_dataset
-    DATASET_GENERATOR_AVAILABLE = True
-except ImportError:
-    DATASET_GENERATOR_AVAILABLE = False
-    print("⚠️ Модуль dataset_generator не найден")
+# dataset_generator (с numpy) импортируется лениво: фоновым прогревом при запуске
+# или при первом обращении. Если модуля нет - ImportError (неудача не кэшируется)
+@lru_cache(maxsize=1)
+def _dataset_generator():
+    """Модуль генерации датасета (импортируется один раз)"""
+    import dataset_generator
+    return dataset_generator
+
+def _prewarm_dataset_generator():
+    """Фоновый импорт dataset_generator, чтобы вкладка датасета открывалась без задержки"""
+    try:
+        _dataset_generator()
+    except ImportError:
+        print("⚠️ Модуль dataset_generator не найден")
 
 # Пытаемся импортировать polars, если нет - используем альтернативы
 try:
@@ -149,6 +172,58 @@ except ImportError:
     POLARS_AVAILABLE = False
     print("⚠️ Polars не установлен, используем CSV")
 
+# Пытаемся импортировать orjson (быстрее разбирает и сериализует JSON), если нет - стандартный json.
+# _json_dumps возвращает UTF-8 байты с отступом 2 пробела в обоих вариантах
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+
+# Пытаемся импортировать ijson (потоковый разбор JSON) - для больших метаданных читаем только нужные ключи
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+def _parse_json_fields(f, fields):
+    """Прочитать из JSON-объекта верхнего уровня только ключи fields (разбор останавливается, когда все найдены)"""
+    result = {}
+    events = ijson.parse(f, use_float=True)
+    
+    for prefix, event, value in events:
+        if prefix not in fields or event == 'map_key':
+            continue
+        
+        if event in ('start_map', 'start_array'):
+            # Вложенное значение собираем целиком до его закрывающего события
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            for inner_prefix, inner_event, inner_value in events:
+                builder.event(inner_event, inner_value)
+                if inner_prefix == prefix and inner_event in ('end_map', 'end_array'):
+                    break
+            result[prefix] = builder.value
+        else:
+            result[prefix] = value
+        
+        if len(result) == len(fields):
+            break
+    
+    return result
+
+# Сходство строк для проверки спуфинга - всегда difflib.SequenceMatcher, чтобы оценка
+# и вердикт не зависели от установленных пакетов
+def _text_ratio(a, b):
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
 if sys.platform == "win32":
     try:
         sys.stdout.reconfigure(encoding='utf-8')
@@ -156,8 +231,593 @@ if sys.platform == "win32":
     except:
         pass
 
+# Открытие аудиофайла во внешнем проигрывателе (способ выбирается по платформе один раз)
+if sys.platform == "win32":
+    _open_audio = os.startfile
+else:
+    _AUDIO_OPENER = "open" if sys.platform == "darwin" else "xdg-open"
+    
+    def _open_audio(filepath):
+        """Запустить проигрыватель без ожидания, чтобы не блокировать цикл Tk"""
+        subprocess.Popen([_AUDIO_OPENER, filepath],
+                         stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL,
+                         close_fds=True)
+
+# Отладочные сообщения записи; по умолчанию выводятся только предупреждения
+logger = logging.getLogger(__name__)
+
 sys.path.append(os.path.dirname(__file__))
 
+# Шаблоны разбора отображаемого отчета (_parse_results_from_displayed_text)
+_QUOTED_RE = re.compile(r'"(.*?)"')
+_DB_RE = re.compile(r'(\d+\.?\d*)\s*дБ')
+_PCT_RE = re.compile(r'(\d+\.?\d*)\s*%')
+_INSIDE_TEXT_RE = re.compile(r'🎤 ВНУТРИ:\s*\n\s*"([^"]+)"', re.IGNORECASE)
+_OUTSIDE_TEXT_RE = re.compile(r'📡 СНАРУЖИ.*?:\s*\n\s*"([^"]+)"', re.IGNORECASE | re.DOTALL)
+
+# Стили HTML отчета (_create_html_report) - статичный текст, не форматируется при каждом вызове
+_HTML_CSS = """\
+    @media print {
+        @page {
+            margin: 2cm;
+            size: A4;
+        }
+        body {
+            font-size: 12pt;
+        }
+        .page-break {
+            page-break-before: always;
+        }
+        .no-print {
+            display: none;
+        }
+    }
+
+    * {
+        box-sizing: border-box;
+        margin: 0;
+        padding: 0;
+    }
+
+    body {
+        font-family: 'Arial', sans-serif;
+        line-height: 1.6;
+        color: #333;
+        max-width: 210mm;
+        margin: 0 auto;
+        padding: 20mm;
+        background-color: #f9f9f9;
+    }
+
+    .header {
+        text-align: center;
+        margin-bottom: 30px;
+        padding-bottom: 20px;
+        border-bottom: 3px solid #2c3e50;
+    }
+
+    .header h1 {
+        color: #2c3e50;
+        font-size: 24pt;
+        margin-bottom: 10px;
+    }
+
+    .header .subtitle {
+        color: #7f8c8d;
+        font-size: 14pt;
+    }
+
+    .info-card {
+        background: white;
+        border-radius: 8px;
+        padding: 20px;
+        margin: 20px 0;
+        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        border-left: 5px solid #3498db;
+    }
+
+    .result-card {
+        background: white;
+        border-radius: 8px;
+        padding: 20px;
+        margin: 20px 0;
+        box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        border-left: 5px solid #2ecc71;
+    }
+
+    .verdict-card {
+        background: white;
+        border-radius: 8px;
+        padding: 30px;
+        margin: 30px 0;
+        box-shadow: 0 4px 15px rgba(0,0,0,0.1);
+        text-align: center;
+        border: 2px solid #e74c3c;
+    }
+
+    .verdict-card h2 {
+        color: #e74c3c;
+        font-size: 20pt;
+        margin-bottom: 15px;
+    }
+
+    .metrics-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
+        gap: 15px;
+        margin: 20px 0;
+    }
+
+    .metric-item {
+        background: #f8f9fa;
+        padding: 15px;
+        border-radius: 6px;
+        text-align: center;
+        border: 1px solid #dee2e6;
+    }
+
+    .metric-value {
+        font-size: 24pt;
+        font-weight: bold;
+        color: #2c3e50;
+        margin: 10px 0;
+    }
+
+    .metric-label {
+        color: #6c757d;
+        font-size: 11pt;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+    }
+
+    h2 {
+        color: #2c3e50;
+        margin: 25px 0 15px 0;
+        padding-bottom: 10px;
+        border-bottom: 2px solid #ecf0f1;
+        font-size: 18pt;
+    }
+
+    h3 {
+        color: #34495e;
+        margin: 20px 0 10px 0;
+        font-size: 14pt;
+    }
+
+    table {
+        width: 100%;
+        border-collapse: collapse;
+        margin: 15px 0;
+        font-size: 11pt;
+    }
+
+    table th {
+        background: #2c3e50;
+        color: white;
+        padding: 12px;
+        text-align: left;
+        font-weight: bold;
+    }
+
+    table td {
+        padding: 12px;
+        border-bottom: 1px solid #ddd;
+    }
+
+    table tr:nth-child(even) {
+        background: #f8f9fa;
+    }
+
+    .recommendations {
+        background: #fff3cd;
+        border-left: 5px solid #ffc107;
+        padding: 20px;
+        margin: 20px 0;
+        border-radius: 6px;
+    }
+
+    .recommendations ul {
+        padding-left: 20px;
+        margin: 10px 0;
+    }
+
+    .recommendations li {
+        margin: 8px 0;
+    }
+
+    .footer {
+        margin-top: 40px;
+        padding-top: 20px;
+        border-top: 2px solid #ecf0f1;
+        text-align: center;
+        color: #7f8c8d;
+        font-size: 10pt;
+    }
+
+    .print-button {
+        display: block;
+        width: 200px;
+        margin: 30px auto;
+        padding: 12px 24px;
+        background: #3498db;
+        color: white;
+        text-align: center;
+        text-decoration: none;
+        border-radius: 6px;
+        font-weight: bold;
+        cursor: pointer;
+        border: none;
+        font-size: 12pt;
+    }
+
+    .print-button:hover {
+        background: #2980b9;
+    }
+
+    .badge {
+        display: inline-block;
+        padding: 5px 10px;
+        border-radius: 20px;
+        font-size: 10pt;
+        font-weight: bold;
+        margin: 0 5px;
+    }
+
+    .badge-success {
+        background: #d4edda;
+        color: #155724;
+    }
+
+    .badge-warning {
+        background: #fff3cd;
+        color: #856404;
+    }
+
+    .badge-danger {
+        background: #f8d7da;
+        color: #721c24;
+    }
+
+    .grade {
+        font-size: 32pt;
+        font-weight: bold;
+        color: #2c3e50;
+        text-align: center;
+        margin: 20px 0;
+    }
+
+    .text-validation {
+        background: #e8f4fd;
+        border-left: 5px solid #3498db;
+        padding: 20px;
+        margin: 20px 0;
+        border-radius: 6px;
+    }
+
+    .text-validation.success {
+        background: #d4edda;
+        border-left: 5px solid #28a745;
+    }
+
+    .text-validation.warning {
+        background: #fff3cd;
+        border-left: 5px solid #ffc107;
+    }
+
+    .text-validation.danger {
+        background: #f8d7da;
+        border-left: 5px solid #dc3545;
+    }
+"""
+
+# В отчет стили пишутся сжатыми: пробельные символы схлопываются, а вокруг { } ; , и после :
+# удаляются (один раз при импорте; пробелы между частями селекторов и значений сохраняются)
+_HTML_CSS_BYTES = (re.sub(r':\s+', ':', re.sub(r'\s*([{};,])\s*', r'\1', ' '.join(_HTML_CSS.split())))
+                   + '\n').encode('utf-8')
+
+# Начало и тело HTML отчета; между ними вставляются стили _HTML_CSS_BYTES, после тела - _HTML_FOOT_BYTES
+_HTML_HEAD = string.Template("""\
+<!DOCTYPE html>
+    <html lang="ru">
+    <head>
+        <meta charset="UTF-8">
+        <meta name="viewport" content="width=device-width, initial-scale=1.0">
+        <title>Отчет по тесту звукоизоляции - $test_name</title>
+        <style>
+""")
+
+_HTML_BODY = string.Template("""\
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>📊 ОТЧЕТ ПО ТЕСТУ ЗВУКОИЗОЛЯЦИИ</h1>
+            <div class="subtitle">Защита от спуфинг-атак - Sound Isolation Tester v3.14</div>
+        </div>
+    
+        <div class="info-card">
+            <h2>📋 ИНФОРМАЦИЯ О ТЕСТЕ</h2>
+            <div class="metrics-grid">
+                <div class="metric-item">
+                    <div class="metric-label">Название теста</div>
+                    <div class="metric-value">$test_name</div>
+                </div>
+                <div class="metric-item">
+                    <div class="metric-label">Дата и время</div>
+                    <div class="metric-value">$timestamp</div>
+                </div>
+                <div class="metric-item">
+                    <div class="metric-label">Длительность</div>
+                    <div class="metric-value">$duration сек</div>
+                </div>
+                <div class="metric-item">
+                    <div class="metric-label">Частота дискретизации</div>
+                    <div class="metric-value">$sample_rate Гц</div>
+                </div>
+            </div>
+        </div>
+    
+$sections    
+        <div class="info-card">
+            <h2>🔧 ТЕХНИЧЕСКИЕ ДАННЫЕ</h2>
+            <table>
+                <tr>
+                    <th>Параметр</th>
+                    <th>Значение</th>
+                </tr>
+                <tr>
+                    <td>Фраза для проверки</td>
+                    <td>"$reference_text"</td>
+                </tr>
+                <tr>
+                    <td>Дата создания отчета</td>
+                    <td>$created</td>
+""")
+
+# Неизменяемый конец HTML отчета после последнего подставляемого поля - закодирован заранее
+_HTML_FOOT_BYTES = """                </tr>
+                <tr>
+                    <td>Версия приложения</td>
+                    <td>Sound Isolation Tester v3.14</td>
+                </tr>
+            </table>
+        </div>
+    
+        <div class="footer">
+            <p>Отчет сгенерирован автоматически. Для печати нажмите Ctrl+P</p>
+            <p>Все данные конфиденциальны и предназначены только для академического использования</p>
+        </div>
+    
+        <button class="print-button no-print" onclick="window.print()">🖨️ Печать отчета</button>
+    
+        <script>
+            window.onload = function() {
+                // Автоматическое открытие диалога печати (можно закомментировать если не нужно)
+                // setTimeout(() => { window.print(); }, 1000);
+            };
+        </script>
+    </body>
+    </html>""".encode('utf-8')
+
+# Значения полей HTML отчета, которых нет в метаданных теста
+_HTML_REPORT_DEFAULTS = {
+    'test_name': 'Неизвестный тест',
+    'timestamp': 'Нет данных',
+    'duration': 0,
+    'sample_rate': 0,
+    'reference_text': 'Не задан',
+}
+
+# Раздел распознавания речи в HTML отчете, когда данных распознавания нет
+_HTML_NO_SPEECH_SECTION = '''
+            <div class="info-card">
+                <h2>🎤 РЕЗУЛЬТАТЫ РАСПОЗНАВАНИЯ РЕЧИ</h2>
+                <table>
+                    <tr>
+                        <th>Параметр</th>
+                        <th>Значение</th>
+                    </tr>
+                    <tr>
+                        <td>Текст внутри помещения</td>
+                        <td>Н/Д (данные распознавания отсутствуют)</td>
+                    </tr>
+                    <tr>
+                        <td>Уверенность внутри</td>
+                        <td>Н/Д</td>
+                    </tr>
+                    <tr>
+                        <td>Текст снаружи помещения</td>
+                        <td>Н/Д</td>
+                    </tr>
+                    <tr>
+                        <td>Уверенность снаружи</td>
+                        <td>Н/Д</td>
+                    </tr>
+                </table>
+            </div>
+            '''
+
+# Общий пустой словарь для цепочек .get() (только для чтения)
+_EMPTY = {}
+
+@lru_cache(maxsize=4096)
+def _parse_timestamp(timestamp):
+    """Время записи ("%Y-%m-%d %H:%M:%S") в секундах epoch; нераспознанное - 0.0"""
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+# Выводы отчета распознавания по отдельным метрикам изоляции
+@lru_cache(maxsize=256)
+def _efficiency_verdict(efficiency):
+    """Вывод по эффективности изоляции (%)"""
+    if efficiency > 70:
+        return "🎉 ОТЛИЧНАЯ изоляция!"
+    elif efficiency > 50:
+        return "✅ ХОРОШАЯ изоляция"
+    elif efficiency > 30:
+        return "⚠️ УДОВЛЕТВОРИТЕЛЬНАЯ изоляция"
+    return "❌ СЛАБАЯ изоляция"
+
+@lru_cache(maxsize=256)
+def _attenuation_verdict(attenuation):
+    """Вывод по ослаблению звука (дБ)"""
+    if attenuation >= 50:
+        return "🎉 Отличная звукоизоляция!"
+    elif attenuation >= 40:
+        return "✅ Хорошая звукоизоляция"
+    elif attenuation >= 30:
+        return "⚠️ Удовлетворительная изоляция"
+    elif attenuation >= 20:
+        return "⚠️ Слабая изоляция"
+    return "❌ Неэффективная изоляция"
+
+@lru_cache(maxsize=256)
+def _word_loss_verdict(lost_words, outside_words, total):
+    """Вывод по словам, потерянным при прохождении через стену"""
+    if lost_words == 0 and outside_words == 0:
+        return "🎉 Идеальная изоляция - снаружи ничего не слышно!"
+    elif lost_words > total * 0.5:
+        return "✅ Хорошая изоляция - потеряно более половины слов"
+    elif lost_words > 0:
+        return "⚠️ Умеренная изоляция"
+    return "❌ Слабая изоляция - все слова слышны снаружи"
+
+@lru_cache(maxsize=4)
+def _read_config(path, mtime):
+    """Разобранный файл конфигурации; mtime в ключе кэша - изменённый файл читается заново.
+    Возвращаемый словарь общий для вызовов - не изменять"""
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
+
+@lru_cache(maxsize=32)
+def _engine_label(engine_name, ok):
+    """Строка состояния выбора движка распознавания"""
+    return f"✅ Выбран: {engine_name}" if ok else f"❌ Ошибка загрузки: {engine_name}"
+
+def _clip(text, limit, keep=None):
+    """Обрезать текст длиннее limit символов до keep (по умолчанию limit) и добавить многоточие"""
+    if len(text) <= limit:
+        return text
+    return text[:limit if keep is None else keep] + "..."
+
+@contextmanager
+def _editable(widget):
+    """Временно разрешить правку текстового виджета, который в остальное время только для чтения.
+    
+    Вся пачка вставок внутри блока - одна правка: автоматические разделители отмены
+    выключаются на время блока, а разделитель ставится один раз в конце.
+    """
+    widget.config(state=tk.NORMAL, autoseparators=False)
+    try:
+        yield widget
+    finally:
+        widget.edit_separator()
+        widget.config(state=tk.DISABLED, autoseparators=True)
+
+# Параметры акустических сценариев быстрой генерации датасета
+_SCENARIO_PARAMS = {
+    "Тихая комната": {
+        'name': 'quiet_room',
+        'noise': 0.02, 'reverb': 0.3, 'types': ['white'], 
+        'room': (4, 5, 3), 'absorption': 0.8, 'distance': 1.0
+    },
+    "Офисное помещение": {
+        'name': 'office',
+        'noise': 0.08, 'reverb': 0.5, 'types': ['white', 'office'], 
+        'room': (6, 8, 3), 'absorption': 0.6, 'distance': 1.5
+    },
+    "Коридор с эхом": {
+        'name': 'corridor',
+        'noise': 0.12, 'reverb': 1.2, 'types': ['pink'], 
+        'room': (15, 3, 3), 'absorption': 0.3, 'distance': 2.0
+    },
+}
+
+@lru_cache(maxsize=None)
+def _build_condition(scenario):
+    """Акустические условия сценария (создаются один раз; генератор их не изменяет)"""
+    params = _SCENARIO_PARAMS[scenario]
+    return _dataset_generator().AcousticCondition(
+        name=params['name'],  # Английское название
+        description=f"Сценарий: {scenario}",
+        background_noise_level=params['noise'],
+        reverberation_time=params['reverb'],
+        noise_types=params['types'],
+        speech_level_variation=0.2,
+        speech_speed_variation=0.1,
+        room_size=params['room'],
+        absorption_coefficient=params['absorption'],
+        distance_to_microphone=params['distance']
+    )
+
+# Все, кроме букв, цифр, "_" и пробельных символов, удаляется при нормализации текста
+# (шаблон компилируется один раз; те же символы, что удалял исходный re.sub)
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+
+@lru_cache(maxsize=256)
+def _normalize_text(text):
+    """Нормализация текста для сравнения с эталонной фразой"""
+    text = _NON_WORD_RE.sub('', str(text).lower().replace('ё', 'е'))
+    return ' '.join(text.split())
+
+# Данные отчета по тесту. Поле None - значение в отчете не найдено.
+# Слоты (Python 3.10+) дают доступ к полям без словаря экземпляра
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_SLOTS)
+class SpeechResults:
+    """Распознанные тексты внутри и снаружи помещения"""
+    inside_text: Optional[str] = None
+    inside_confidence: Optional[str] = None
+    outside_text: Optional[str] = None
+    outside_confidence: Optional[str] = None
+
+@dataclass(**_SLOTS)
+class SpoofingResults:
+    """Результат проверки на спуфинг"""
+    match_score: Optional[str] = None
+    threshold: Optional[str] = None
+    confidence: Optional[str] = None
+    reference_text: Optional[str] = None
+    recognized_text: Optional[str] = None
+
+@dataclass(**_SLOTS)
+class AnalysisResults:
+    """Оценка звукоизоляции"""
+    attenuation_db: Optional[str] = None
+    isolation_efficiency: Optional[str] = None
+    total_words: Optional[str] = None
+    lost_words: Optional[str] = None
+
+@dataclass(**_SLOTS)
+class ReportData:
+    """Все данные отчета, разобранные из отображаемого текста"""
+    test_name: str
+    metadata: Dict = field(default_factory=dict)
+    has_speech_data: bool = False
+    has_spoofing_data: bool = False
+    has_analysis_data: bool = False
+    speech: SpeechResults = field(default_factory=SpeechResults)
+    spoofing: SpoofingResults = field(default_factory=SpoofingResults)
+    analysis: AnalysisResults = field(default_factory=AnalysisResults)
+    parsed_sections: List[str] = field(default_factory=list)
+    
+    @property
+    def has_any_data(self):
+        return self.has_speech_data or self.has_spoofing_data or self.has_analysis_data
+    
+    def sections(self):
+        """Пары (раздел, {параметр: значение}) только с найденными значениями"""
+        for name, results in (('speech_results', self.speech),
+                              ('spoofing_results', self.spoofing),
+                              ('analysis_results', self.analysis)):
+            values = {f.name: getattr(results, f.name) for f in fields(results)}
+            yield name, {key: value for key, value in values.items() if value is not None}
+
 class RecordingIndicator(tk.Canvas):
     """Анимированный индикатор записи с барами"""
     
@@ -170,6 +830,7 @@ class RecordingIndicator(tk.Canvas):
         self.is_active = False
         self.bars = []
         self.animation_id = None
+        self._rng = random.Random()  # Собственный генератор для дрожания баров
         
         # Темный фон
         self.create_rectangle(0, 0, width, height, fill="#1a1a2e", outline="")
@@ -178,7 +839,7 @@ class RecordingIndicator(tk.Canvas):
         self.title = self.create_text(
             width//2, 20, 
             text=label, 
-            font=('Arial', 12, 'bold'),
+            font='AppHeader',
             fill="white"
         )
         
@@ -199,7 +860,7 @@ class RecordingIndicator(tk.Canvas):
             x2 = x1 + bar_width
             bar = self.create_rectangle(
                 x1, height-20, x2, height-20,  # Начинаем с минимальной высоты
-                fill="#00b894", outline="#00b894"
+                fill="#00b894", outline=""  # Без обводки Tk пропускает проход отрисовки контура
             )
             self.bars.append(bar)
         
@@ -213,17 +874,21 @@ class RecordingIndicator(tk.Canvas):
         self.record_text = self.create_text(
             width-27, 22,
             text="●",
-            font=('Arial', 10, 'bold'),
+            font='AppBold',
             fill="white"
         )
         
-        # Текущий уровень
-        self.level_text = self.create_text(
-            width//2, height-5,
-            text="Уровень: 0%",
-            font=('Arial', 9),
-            fill="#95a5a6"
+        # Текущий уровень (Label со StringVar - Tk сам объединяет перерисовки)
+        self.level_var = tk.StringVar(value="Уровень: 0%")
+        self.level_label = ttk.Label(
+            self,
+            textvariable=self.level_var,
+            style="Small.TLabel",
+            foreground="#95a5a6",
+            background="#1a1a2e",
+            padding=0
         )
+        self.level_text = self.create_window(width//2, height-7, window=self.level_label)
     
     def set_active(self, active):
         """Активировать/деактивировать индикатор"""
@@ -242,7 +907,7 @@ class RecordingIndicator(tk.Canvas):
         self.level = max(0.0, min(1.0, level))
         
         # Обновляем текст уровня
-        self.itemconfig(self.level_text, text=f"Уровень: {int(self.level*100)}%")
+        self.level_var.set(f"Уровень: {int(self.level*100)}%")
     
     def _start_animation(self):
         """Запустить анимацию баров"""
@@ -281,11 +946,11 @@ class RecordingIndicator(tk.Canvas):
             
             if i < active_bars:
                 # Этот бар должен быть активным
-                target_height = max_bar_height * (i / num_bars) + random.uniform(10, 30)
+                target_height = max_bar_height * (i / num_bars) + self._rng.uniform(10, 30)
                 target_top = self.height - 20 - target_height
                 
                 # Добавляем немного случайности для естественного вида
-                target_top += random.uniform(-5, 5)
+                target_top += self._rng.uniform(-5, 5)
                 target_top = max(self.height - 20 - max_bar_height, min(self.height - 25, target_top))
                 
                 # Плавная анимация к целевой позиции
@@ -307,7 +972,7 @@ class RecordingIndicator(tk.Canvas):
                 else:
                     color = "#e17055"  # Оранжевый/Красный
                 
-                self.itemconfig(bar, fill=color, outline=color)
+                self.itemconfig(bar, fill=color)
             else:
                 # Неактивный бар - опускаем вниз
                 current_top = y1
@@ -317,7 +982,7 @@ class RecordingIndicator(tk.Canvas):
                     self.coords(bar, x1, new_top, x2, self.height-20)
                 else:
                     self.coords(bar, x1, self.height-20, x2, self.height-20)
-                    self.itemconfig(bar, fill="#00b894", outline="#00b894")
+                    self.itemconfig(bar, fill="#00b894")
         
         # Продолжаем анимацию
         self.animation_id = self.after(50, self._animate_bars)
@@ -326,9 +991,119 @@ class RecordingIndicator(tk.Canvas):
         """Сбросить индикатор"""
         self.level = 0.0
         self.set_active(False)
-        self.itemconfig(self.level_text, text="Уровень: 0%")
+        self.level_var.set("Уровень: 0%")
 
 class AdvancedSoundTester:
+    # Именованные шрифты приложения: имя -> (размер, насыщенность)
+    APP_FONTS = {
+        'AppTitle': (14, 'bold'),
+        'AppHeader': (12, 'bold'),
+        'AppSection': (11, 'bold'),
+        'AppBold': (10, 'bold'),
+        'AppBody': (10, 'normal'),
+        'AppSmallBold': (9, 'bold'),
+        'AppSmall': (9, 'normal'),
+    }
+    
+    # Метки поля результатов: настраиваются один раз при создании виджета
+    RESULT_TEXT_TAGS = {
+        "header": {'font': 'AppHeader', 'foreground': 'darkblue'},
+        "section_audio_ok": {'font': 'AppSection', 'foreground': 'darkgreen'},
+        "section_audio_err": {'font': 'AppSection', 'foreground': 'darkred'},
+        "section_texts": {'font': 'AppSection', 'foreground': 'darkblue'},
+        "section_isolation": {'font': 'AppSection', 'foreground': 'darkred'},
+        "section_metrics": {'font': 'AppSection', 'foreground': 'purple'},
+        "section_recommendations": {'font': 'AppSection', 'foreground': 'darkorange'},
+    }
+    
+    # Цвета вердикта, которые выдает анализатор (метки verdict_<цвет>)
+    VERDICT_COLORS = ("darkgreen", "green", "orange", "red", "darkred", "purple", "black")
+    
+    # Поля метаданных, нужные списку записей; файлы больше порога разбираются частично (ijson)
+    RECORDING_META_FIELDS = frozenset(('test_name', 'timestamp', 'duration', 'files',
+                                       'analysis_ready', 'analysis_engine'))
+    PARTIAL_PARSE_MIN_SIZE = 64 * 1024
+    
+    # Порционный вывод отчетов: текст длиннее порога вставляется кусками
+    RESULT_STREAM_THRESHOLD = 4096
+    RESULT_STREAM_CHUNK = 2048
+    
+    # Разделы отображаемого отчета: заголовок -> раздел, раздел -> префикс его конца
+    RESULT_SECTION_HEADERS = (("📝 РАСПОЗНАННЫЕ ТЕКСТЫ:", "speech"),
+                              ("🔍 ПРОВЕРКА АУДИО ВНУТРИ ПОМЕЩЕНИЯ:", "spoofing"),
+                              ("📊 ОЦЕНКА ЗВУКОИЗОЛЯЦИИ", "analysis"))
+    RESULT_SECTION_PREFIXES = tuple(prefix for prefix, _ in RESULT_SECTION_HEADERS)
+    RESULT_SECTION_TERMINATORS = {"speech": "📊", "spoofing": "📝", "analysis": "📈"}
+    
+    # Известные модели распознавания (см. download_models.py)
+    WHISPER_MODELS = ("tiny", "base", "small", "medium")
+    VOSK_MODELS = ("small-ru", "large-ru")
+    
+    # Инструкция окна загрузки моделей
+    DOWNLOAD_INFO_TEXT = """Для загрузки моделей выполните:
+
+1. Запустите скрипт download_models.py:
+   • Откройте командную строку/терминал
+   • Перейдите в папку с проектом
+   • Выполните: python download_models.py
+
+2. Или выполните вручную:
+   • pip install vosk whisper
+   • Загрузите модели Whisper:
+     https://github.com/openai/whisper
+   • Загрузите модели Vosk:
+     https://alphacephei.com/vosk/models"""
+    
+    # Колонки списка записей: (ключ, заголовок, ширина)
+    RECORDINGS_COLUMNS = (
+        ("name", "Имя теста", 180),
+        ("date", "Дата", 140),
+        ("duration", "Длительность", 80),
+        ("size", "Размер", 70),
+        ("status", "Статус", 80),
+        ("engine", "Движок", 100),
+        ("text_check", "Проверка текста", 120),
+    )
+    
+    # Сценарии быстрой генерации: (название, описание, выбран по умолчанию).
+    # Названия - ключи _SCENARIO_PARAMS
+    QUICK_SCENARIOS = (
+        ("Тихая комната", "Низкий шум, хорошая акустика", True),
+        ("Офисное помещение", "Умеренный шум, разговоры на фоне", False),
+        ("Коридор с эхом", "Средний шум, реверберация", False),
+    )
+    
+    # Тестовый датасет: условия (название, описание, параметры) и статистика (подпись, значение)
+    DIPLOMA_CONDITIONS = (
+        ("1. Ideal Conditions", "Идеальные условия (эталон)", "Низкий шум, хорошая акустика"),
+        ("2. Quiet Office", "Тихий офис", "Умеренный шум, фоновая речь"),
+    )
+    DIPLOMA_STATS = (
+        ("Всего сэмплов:", "20 (2 условия × 10 сэмплов)"),
+        ("Длительность:", "3-6 секунд каждый"),
+        ("Частота дискретизации:", "16 кГц (стандарт для распознавания)"),
+        ("Общий объем:", "≈ 10-20 МБ"),
+        ("Форматы:", "WAV аудио + CSV (UTF-8) + JSON"),
+        ("Кодировка CSV:", "UTF-8-BOM (открывается в Excel)"),
+    )
+    
+    # Каналы воспроизведения по ответу диалога выбора: (суффикс файла, название канала);
+    # любой другой ответ ("Отмена") - оба канала по очереди
+    PLAYBACK_CHANNELS = {
+        messagebox.YES: (("outside", "СНАРУЖИ"),),
+        messagebox.NO: (("inside", "ВНУТРИ"),),
+    }
+    PLAYBACK_BOTH = (("outside", "СНАРУЖИ"), ("inside", "ВНУТРИ"))
+    PLAYBACK_GAP_MS = 1000
+    
+    # Синусоида тестовой анимации: 60 кадров по 50 мс (3 секунды)
+    _TEST_WAVE = tuple((math.sin(frame * 0.05 * 5) + 1) / 2 for frame in range(60))
+    
+    # Период демо-анимации уровней (если AudioCore не отдает уровни): 60 точек,
+    # скорость как у sin(3t)
+    _DEMO_WAVE = tuple((math.sin(2 * math.pi * i / 60) + 1) / 2 for i in range(60))
+    _DEMO_RATE = 3 * 60 / (2 * math.pi)
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Sound Isolation Tester")
@@ -349,7 +1124,10 @@ class AdvancedSoundTester:
             self.recognizer = None
             if SPEECH_RECOGNITION_AVAILABLE:
                 try:
-                    self.recognizer = MultiEngineSpeechRecognizer(models_dir="models")
+                    # Анализатор уже создал свой распознаватель - используем его же,
+                    # чтобы каждая модель загружалась в память один раз
+                    self.recognizer = (getattr(self.analyzer, 'recognizer', None)
+                                       or MultiEngineSpeechRecognizer(models_dir="models"))
                     self.current_engine = None
                     print("✅ Распознаватель речи инициализирован")
                 except Exception as e:
@@ -364,6 +1142,58 @@ class AdvancedSoundTester:
             if not os.path.exists(self.recordings_folder):
                 os.makedirs(self.recordings_folder)
             
+            # Сигнатура последнего списка устройств (для пропуска повторного заполнения)
+            self._device_sig = None
+            
+            # Очередь вызовов из рабочих потоков в поток Tk
+            self._ui_queue = queue.Queue()
+            
+            # Фоновые файловые операции (удаление записей), чтобы не блокировать mainloop
+            self._io_executor = ThreadPoolExecutor(max_workers=2)
+            
+            # Анализ записей в фоне; один поток - анализы идут по очереди (модели общие)
+            self._analysis_executor = ThreadPoolExecutor(max_workers=1)
+            
+            # Модель распознавания (self.recognizer, он же self.analyzer.recognizer) одна на
+            # все потоки: анализ, распознавание и смена движка используют ее только под замком
+            self._recognizer_lock = threading.Lock()
+            
+            # Идентификаторы отложенных вызовов мониторинга уровней и таймера записи
+            self._level_after_id = None
+            self._timer_after_id = None
+            
+            # Отложенный шаг порционного вывода отчета в поле результатов
+            self._result_stream_id = None
+            
+            # Строки последнего выведенного отчета (парсер читает их вместо содержимого виджета)
+            self._last_result_lines = None
+            
+            # Переиспользуемое окно прогресса распознавания (создается при первом показе)
+            self._progress_window = None
+            self._progress_run = 0
+            
+            # Кэш сканирования папок моделей и записей (ключ - mtime папок)
+            self._models_cache = {}
+            
+            # Кэш разобранных JSON записей: путь -> (mtime_ns, размер, данные)
+            self._meta_cache = {}
+            
+            # Кэш списка записей: (mtime_ns папки, список)
+            self._rec_list_cache = None
+            
+            # Имена файлов папки записей по последнему сканированию (вместо os.path.exists)
+            self._known_files = set()
+            
+            # Метаданные тестов для отчетов: имя теста -> (mtime_ns файла, словарь) (сбрасывается при удалении записи)
+            self._metadata_cache = {}
+            
+            # Неизменяемая часть информации о системе
+            self._sysinfo_static = (
+                f"🐍 Python: {sys.version.split(maxsplit=1)[0]}\n"
+                f"💻 ОС: {sys.platform}\n"
+                f"📁 Папка проекта: {os.path.abspath('.')}\n"
+            )
+            
             self.setup_styles()
             self.setup_ui()
             self.refresh_devices()
@@ -372,8 +1202,14 @@ class AdvancedSoundTester:
             # Загружаем последнюю конфигурацию
             self.load_config()
             
-            # Флаг для мониторинга
-            self.monitoring_active = False
+            # Модуль генерации датасета импортируется в фоне
+            threading.Thread(target=_prewarm_dataset_generator, daemon=True).start()
+            
+            # Запускаем обработку очереди UI-вызовов
+            self.root.after(50, self._drain_ui_queue)
+            
+            # Мониторинг уровней активен, пока событие установлено
+            self._monitoring_evt = threading.Event()
             
             # Флаг истечения времени записи
             self.recording_timer_active = False
@@ -387,8 +1223,7 @@ class AdvancedSoundTester:
             
         except Exception as e:
             print(f"❌ Критическая ошибка инициализации: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Ошибка инициализации приложения")
             
             error_msg = f"Ошибка инициализации:\n\n{str(e)}\n\n"
             error_msg += "Проверьте:\n"
@@ -398,6 +1233,20 @@ class AdvancedSoundTester:
             
             messagebox.showerror("Ошибка инициализации", error_msg)
     
+    def _drain_ui_queue(self):
+        """Выполнить в потоке Tk все вызовы, накопленные рабочими потоками"""
+        try:
+            while True:
+                func, args = self._ui_queue.get_nowait()
+                try:
+                    func(*args)
+                except Exception as e:
+                    print(f"⚠️ Ошибка обработки UI-вызова: {e}")
+        except queue.Empty:
+            pass
+        
+        self.root.after(50, self._drain_ui_queue)
+    
     def _create_directories(self):
         """Создание необходимых папок"""
         folders = ["models", "models/whisper", "models/vosk", "recordings", "experiments"]
@@ -415,10 +1264,24 @@ class AdvancedSoundTester:
     
     def setup_styles(self):
         """Настройка стилей"""
+        # Именованные шрифты регистрируются один раз, виджеты ссылаются на них по имени
+        self._fonts = {
+            name: tkfont.Font(name=name, family='Arial', size=size, weight=weight)
+            for name, (size, weight) in self.APP_FONTS.items()
+        }
+        
         style = ttk.Style()
-        style.configure("Red.TButton", foreground="red", font=('Arial', 10, 'bold'))
-        style.configure("Green.TButton", foreground="green", font=('Arial', 10, 'bold'))
-        style.configure("Title.TLabel", font=('Arial', 14, 'bold'))
+        style.configure("Red.TButton", foreground="red", font='AppBold')
+        style.configure("Green.TButton", foreground="green", font='AppBold')
+        
+        # Стили меток по именованным шрифтам: AppTitle -> Title.TLabel и т.д.
+        for name in self.APP_FONTS:
+            style.configure(f"{name[3:]}.TLabel", font=name)
+        
+        # Цветные прогресс бары окна результата спуфинга
+        for name, color in (("green", "green"), ("yellow", "orange"), ("red", "red")):
+            style.configure(f"{name}.Horizontal.TProgressbar",
+                            background=color, troughcolor='lightgray')
     
     def setup_ui(self):
         """Настройка интерфейса"""
@@ -429,32 +1292,36 @@ class AdvancedSoundTester:
         # Заголовок
         title = ttk.Label(main_frame, 
             text="🧪 ТЕСТЕР ЗВУКОИЗОЛЯЦИИ",
-            font=('Arial', 14, 'bold'))
+            style="Title.TLabel")
         title.pack(pady=10)
         
         # Вкладки
-        notebook = ttk.Notebook(main_frame)
-        notebook.pack(fill=tk.BOTH, expand=True, pady=10)
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill=tk.BOTH, expand=True, pady=10)
         
         # Вкладка 1: Запись
-        record_frame = ttk.Frame(notebook, padding="10")
-        notebook.add(record_frame, text="🎙️ ЗАПИСЬ")
+        record_frame = ttk.Frame(self.notebook, padding="10")
+        self.notebook.add(record_frame, text="🎙️ ЗАПИСЬ")
         self.setup_record_tab(record_frame)
         
-        # Вкладка 2: Анализ
-        analysis_frame = ttk.Frame(notebook, padding="10")
-        notebook.add(analysis_frame, text="📊 АНАЛИЗ")
-        self.setup_analysis_tab(analysis_frame)
+        # Вкладки 2-4 (Анализ, Движки, Датасет) строятся при первом открытии
+        self._tab_builders = {}
+        self._tab_names = {}
+        self._tabs_built = set()
+        
+        lazy_tabs = [
+            ("analysis", "📊 АНАЛИЗ", self._build_analysis_tab),
+            ("engine", "⚙️ ДВИЖКИ", self.setup_engine_tab),
+            ("export", "📁 ДАТАСЕТ", self.setup_export_tab),
+        ]
         
-        # Вкладка 3: Настройки движков
-        engine_frame = ttk.Frame(notebook, padding="10")
-        notebook.add(engine_frame, text="⚙️ ДВИЖКИ")
-        self.setup_engine_tab(engine_frame)
+        for name, text, builder in lazy_tabs:
+            frame = ttk.Frame(self.notebook, padding="10")
+            self.notebook.add(frame, text=text)
+            self._tab_builders[name] = (frame, builder)
+            self._tab_names[str(frame)] = name
         
-        # Вкладка 4: Генерация дата сета
-        export_frame = ttk.Frame(notebook, padding="10")
-        notebook.add(export_frame, text="📁 ДАТАСЕТ")
-        self.setup_export_tab(export_frame)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
         
         # Статус
         self.status_var = tk.StringVar(value="✅ Готов к работе")
@@ -462,6 +1329,26 @@ class AdvancedSoundTester:
                               relief=tk.SUNKEN, padding=5)
         status_bar.pack(fill=tk.X, pady=5)
     
+    def _on_tab_changed(self, event):
+        """Построить вкладку при первом переключении на нее"""
+        name = self._tab_names.get(self.notebook.select())
+        if name:
+            self._ensure_tab(name)
+    
+    def _ensure_tab(self, name):
+        """Построить отложенную вкладку, если она еще не создана"""
+        if name in self._tabs_built:
+            return
+        
+        self._tabs_built.add(name)
+        frame, builder = self._tab_builders[name]
+        builder(frame)
+    
+    def _build_analysis_tab(self, parent):
+        """Построить вкладку анализа и заполнить список записей"""
+        self.setup_analysis_tab(parent)
+        self.refresh_recordings_list()
+    
     def setup_record_tab(self, parent):
         """Вкладка записи"""
         # Блок 1: Устройства
@@ -469,12 +1356,12 @@ class AdvancedSoundTester:
         device_frame.pack(fill=tk.X, pady=10)
         
         # Внешний микрофон
-        ttk.Label(device_frame, text="Снаружи:", font=('Arial', 10)).grid(row=0, column=0, sticky=tk.W, pady=5)
+        ttk.Label(device_frame, text="Снаружи:", style="Body.TLabel").grid(row=0, column=0, sticky=tk.W, pady=5)
         self.outside_combo = ttk.Combobox(device_frame, width=60, state="readonly")
         self.outside_combo.grid(row=0, column=1, padx=10, pady=5)
         
         # Внутренний микрофон
-        ttk.Label(device_frame, text="Внутри:", font=('Arial', 10)).grid(row=1, column=0, sticky=tk.W, pady=5)
+        ttk.Label(device_frame, text="Внутри:", style="Body.TLabel").grid(row=1, column=0, sticky=tk.W, pady=5)
         self.inside_combo = ttk.Combobox(device_frame, width=60, state="readonly")
         self.inside_combo.grid(row=1, column=1, padx=10, pady=5)
         
@@ -532,9 +1419,9 @@ class AdvancedSoundTester:
         ttk.Spinbox(params_frame, from_=5, to=300, textvariable=self.duration_var, width=15).grid(row=1, column=1, padx=10, pady=5, sticky=tk.W)
         
         # ФРАЗА ДЛЯ ПРОВЕРКИ (НОВОЕ)
-        ttk.Label(params_frame, text="Фраза для проверки:", font=('Arial', 10, 'bold')).grid(row=2, column=0, sticky=tk.W, pady=5)
+        ttk.Label(params_frame, text="Фраза для проверки:", style="Bold.TLabel").grid(row=2, column=0, sticky=tk.W, pady=5)
         self.reference_text_var = tk.StringVar(value="Красный трактор стоит на зеленом поле сорок два")
-        self.reference_entry = ttk.Entry(params_frame, textvariable=self.reference_text_var, width=60, font=('Arial', 10))
+        self.reference_entry = ttk.Entry(params_frame, textvariable=self.reference_text_var, width=60, font='AppBody')
         self.reference_entry.grid(row=2, column=1, padx=10, pady=5)
         
         # Кнопка для генерации случайной фразы
@@ -580,7 +1467,8 @@ class AdvancedSoundTester:
         self.record_status.pack(side=tk.LEFT, padx=10)
         
         # Таймер
-        self.timer_label = ttk.Label(indicator_frame, text="00:00 / 00:00", font=('Arial', 12, 'bold'))
+        self.timer_var = tk.StringVar(value="00:00 / 00:00")
+        self.timer_label = ttk.Label(indicator_frame, textvariable=self.timer_var, style="Header.TLabel")
         self.timer_label.pack(side=tk.RIGHT)
         
         # Подсказка
@@ -605,7 +1493,6 @@ class AdvancedSoundTester:
             "Яркая звезда светит в темном небе сто одиннадцать"
         ]
         
-        import random
         phrase = random.choice(phrases)
         self.reference_text_var.set(phrase)
         print(f"🎲 Сгенерирована новая фраза: {phrase}")
@@ -614,16 +1501,23 @@ class AdvancedSoundTester:
         """Обновить список аудиоустройств"""
         try:
             self.status_var.set("🔄 Поиск аудиоустройств...")
-            self.root.update()
+            self.root.update_idletasks()
             
             devices = self.audio_core.get_audio_devices()
             
+            # Список устройств не изменился - комбобоксы и выбор оставляем как есть
+            sig = tuple((d['name'], d['channels']) for d in devices)
+            if devices and sig == self._device_sig:
+                self.status_var.set(f"✅ Найдено устройств: {len(devices)}")
+                return True
+            self._device_sig = sig
+            
             # Очищаем комбобоксы
             self.outside_combo.set('')
             self.inside_combo.set('')
             
             # Заполняем устройствами
-            device_names = [f"{i}: {d['name']} ({d['channels']} каналов)" for i, d in enumerate(devices)]
+            device_names = tuple(f"{i}: {name} ({channels} каналов)" for i, (name, channels) in enumerate(sig))
             
             self.outside_combo['values'] = device_names
             self.inside_combo['values'] = device_names
@@ -686,7 +1580,8 @@ class AdvancedSoundTester:
             )
             
             if success:
-                time.sleep(2.5)  # Ждем завершения
+                # Ждем, пока таймер AudioCore остановит и сохранит запись
+                self.audio_core.recording_done_event.wait(timeout=3.0)
                 stats = self.audio_core.get_recording_stats()
                 
                 # Выключаем индикаторы
@@ -711,13 +1606,11 @@ class AdvancedSoundTester:
     
     def _start_test_animation(self):
         """Запустить тестовую анимацию индикаторов"""
-        test_start = time.time()
+        frames = iter(self._TEST_WAVE)
         
         def animate():
-            elapsed = time.time() - test_start
-            if elapsed < 3:  # 3 секунды анимации
-                # Синусоидальная анимация
-                level = (math.sin(elapsed * 5) + 1) / 2
+            level = next(frames, None)
+            if level is not None:
                 self.outside_indicator.update_level(level * 0.8)
                 self.inside_indicator.update_level(level * 0.6)
                 self.root.after(50, animate)
@@ -731,12 +1624,12 @@ class AdvancedSoundTester:
     def show_indicators(self):
         """Показать индикаторы записи"""
         self.indicator_frame.pack(fill=tk.X, pady=10)
-        self.root.update()
+        self.root.update_idletasks()
     
     def hide_indicators(self):
         """Скрыть индикаторы записи"""
         self.indicator_frame.pack_forget()
-        self.root.update()
+        self.root.update_idletasks()
     
     def start_recording(self):
         """Начать запись"""
@@ -750,16 +1643,14 @@ class AdvancedSoundTester:
         
             test_name = self.test_name_var.get()
             duration = int(self.duration_var.get())
-            reference_text = self.reference_text_var.get() if self.enable_text_check_var.get() else None
+            text_check_enabled = self.enable_text_check_var.get()
+            reference_text = self.reference_text_var.get() if text_check_enabled else None
         
-            # ДОБАВЬТЕ ОТЛАДОЧНУЮ ПЕЧАТЬ
-            print(f"\n🎤 ==== НАЧАЛО ЗАПИСИ ====")
-            print(f"📝 Фраза из UI: '{reference_text}'")
-            print(f"✅ Проверка текста включена: {self.enable_text_check_var.get()}")
-            print(f"=================================\n")
+            logger.debug("🎤 Начало записи: фраза из UI %r, проверка текста %s",
+                         reference_text, text_check_enabled)
         
             # Проверка наличия текста для проверки
-            if self.enable_text_check_var.get() and not reference_text.strip():
+            if text_check_enabled and not reference_text.strip():
                 messagebox.showwarning("Предупреждение", 
                     "Введите фразу для проверки или отключите проверку текста.\n"
                     "Это необходимо для защиты от спуфинг-атак.")
@@ -771,23 +1662,19 @@ class AdvancedSoundTester:
             self.record_status.config(text="🔴 ИДЕТ ЗАПИСЬ", foreground="red")
             self.status_var.set("🎙️ Запись начата... Произнесите фразу снаружи!")
         
-            # Показываем фразу для произнесения
-            if reference_text:
-                messagebox.showinfo("Произнесите фразу", 
-                    f"ВНУТРИ помещения произнесите громко и четко:\n\n"
-                    f"📢 '{reference_text}'\n\n"
-                    f"Система проверит соответствие текста ВНУТРИ помещения\n"
-                    f"для защиты от спуфинг-атак (использования записанной речи).")
-        
             # Показываем и активируем индикаторы
             self.show_indicators()
             self.outside_indicator.set_active(True)
             self.inside_indicator.set_active(True)
         
             # Запускаем мониторинг уровней
-            self.monitoring_active = True
+            self._monitoring_evt.set()
+            self._demo_mode = False
             self._start_level_monitoring()
         
+            # Фраза понадобится для анализа после остановки записи
+            self._recording_reference_text = reference_text
+        
             # Запускаем запись в отдельном потоке - ИСПРАВЛЕНО!
             self.recording_thread = threading.Thread(
                 target=self._perform_recording,
@@ -797,40 +1684,74 @@ class AdvancedSoundTester:
             self.recording_thread.start()
         
             # Запускаем таймер с указанием общей длительности
-            self.start_time = time.time()
+            self.start_time = time.monotonic()
             self.recording_duration = duration  # Сохраняем длительность
             self._update_timer()
         
+            # Показываем фразу для произнесения (немодально - запись уже идет)
+            if reference_text:
+                self._show_phrase_window(reference_text)
+        
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка начала записи: {e}")
             self._stop_recording_ui()
     
+    def _show_phrase_window(self, reference_text):
+        """Показать фразу для произнесения в немодальном окне (закрывается при остановке записи)"""
+        self._close_phrase_window()
+        
+        window = tk.Toplevel(self.root)
+        window.title("Произнесите фразу")
+        window.transient(self.root)
+        
+        ttk.Label(window, text="ВНУТРИ помещения произнесите громко и четко:").pack(padx=20, pady=(15, 5))
+        ttk.Label(window, text=f"📢 '{reference_text}'", style="Header.TLabel", wraplength=500).pack(padx=20, pady=5)
+        ttk.Label(window,
+                 text="Система проверит соответствие текста ВНУТРИ помещения\n"
+                      "для защиты от спуфинг-атак (использования записанной речи).",
+                 justify=tk.CENTER).pack(padx=20, pady=5)
+        ttk.Button(window, text="OK", command=window.destroy).pack(pady=(5, 15))
+        
+        self._phrase_window = window
+    
+    def _close_phrase_window(self):
+        """Закрыть окно с фразой, если оно открыто"""
+        window = getattr(self, '_phrase_window', None)
+        if window is not None and window.winfo_exists():
+            window.destroy()
+        self._phrase_window = None
+    
     def _start_level_monitoring(self):
         """Запустить мониторинг уровней звука"""
-        if self.monitoring_active:
+        if not self._monitoring_evt.is_set():
+            return
+        
+        if not self._demo_mode:
             try:
-                # Получаем реальные уровни звука
-                levels = self.audio_core.get_audio_levels()
-                
-                # Обновляем индикаторы
-                self.outside_indicator.update_level(levels['outside'])
-                self.inside_indicator.update_level(levels['inside'])
-                
-                # Добавляем немного случайности для естественности
-                if random.random() < 0.3:  # 30% chance
-                    outside_noise = levels['outside'] + random.uniform(-0.05, 0.1)
-                    inside_noise = levels['inside'] + random.uniform(-0.03, 0.07)
-                    self.outside_indicator.update_level(max(0, min(1, outside_noise)))
-                    self.inside_indicator.update_level(max(0, min(1, inside_noise)))
+                # Перерисовываем только если callback записал новый уровень
+                level_event = self.audio_core.level_update_event
+                if level_event.is_set():
+                    level_event.clear()
+                    
+                    # Получаем реальные уровни звука (чтение без блокировки)
+                    levels = self.audio_core.get_audio_levels()
+                    
+                    # Обновляем индикаторы
+                    self.outside_indicator.update_level(levels['outside'])
+                    self.inside_indicator.update_level(levels['inside'])
                 
             except Exception as e:
-                # Если ошибка, используем демо-анимацию
-                demo_level = (math.sin(time.time() * 3) + 1) / 2
-                self.outside_indicator.update_level(demo_level * 0.8)
-                self.inside_indicator.update_level(demo_level * 0.5)
-            
-            # Продолжаем мониторинг
-            self.root.after(100, self._start_level_monitoring)
+                # Уровни недоступны - до конца записи показываем демо-анимацию
+                print(f"⚠️ Уровни звука недоступны, демо-режим: {e}")
+                self._demo_mode = True
+        
+        if self._demo_mode:
+            demo_level = self._DEMO_WAVE[int(time.monotonic() * self._DEMO_RATE) % 60]
+            self.outside_indicator.update_level(demo_level * 0.8)
+            self.inside_indicator.update_level(demo_level * 0.5)
+        
+        # Продолжаем мониторинг
+        self._level_after_id = self.root.after(100, self._start_level_monitoring)
     
     def _perform_recording(self, outside_idx, inside_idx, duration, test_name, reference_text=None):
         """Выполнить запись с сохранением фразы для проверки спуфинга"""
@@ -838,27 +1759,27 @@ class AdvancedSoundTester:
             # Сохраняем длительность для проверки
             self.recording_duration = duration
         
-            # ДОБАВЬТЕ ЭТУ ОТЛАДОЧНУЮ ПЕЧАТЬ
-            print(f"\n🔊 ==== ВЫПОЛНЕНИЕ ЗАПИСИ ====")
-            print(f"📝 Передаваемая фраза в audio_core: '{reference_text}'")
-            print(f"===================================\n")
+            logger.debug("🔊 Выполнение записи: фраза для audio_core %r", reference_text)
         
             success = self.audio_core.start_recording(
                 outside_idx, inside_idx, duration, test_name, reference_text
             )
         
             if not success:
-                self.root.after(0, lambda: messagebox.showerror("Ошибка", "Не удалось начать запись"))
-                self.root.after(0, self._stop_recording_ui)
+                self._ui_queue.put((self._on_recording_failed, ("Не удалось начать запись",)))
             
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Ошибка", f"Ошибка записи: {e}"))
-            self.root.after(0, self._stop_recording_ui)
+            self._ui_queue.put((self._on_recording_failed, (f"Ошибка записи: {e}",)))
+    
+    def _on_recording_failed(self, message):
+        """Показать ошибку записи и вернуть интерфейс в исходное состояние"""
+        messagebox.showerror("Ошибка", message)
+        self._stop_recording_ui()
     
     def _update_timer(self):
         """Обновление таймера с автоматической остановкой"""
         if hasattr(self, 'start_time') and hasattr(self, 'recording_duration'):
-            elapsed = int(time.time() - self.start_time)
+            elapsed = int(time.monotonic() - self.start_time)
             remaining = max(0, self.recording_duration - elapsed)
             
             # Форматируем время
@@ -867,7 +1788,7 @@ class AdvancedSoundTester:
             total_min = self.recording_duration // 60
             total_sec = self.recording_duration % 60
             
-            self.timer_label.config(text=f"{elapsed_min:02d}:{elapsed_sec:02d} / {total_min:02d}:{total_sec:02d}")
+            self.timer_var.set(f"{elapsed_min:02d}:{elapsed_sec:02d} / {total_min:02d}:{total_sec:02d}")
             
             # Проверяем, не истекло ли время записи
             if elapsed >= self.recording_duration:
@@ -877,45 +1798,57 @@ class AdvancedSoundTester:
                 return
             
             # Продолжаем обновление каждую секунду
-            self.root.after(1000, self._update_timer)
+            self._timer_after_id = self.root.after(1000, self._update_timer)
     
     def stop_recording(self):
         """Остановить запись"""
         try:
             # Останавливаем мониторинг
-            self.monitoring_active = False
+            self._monitoring_evt.clear()
             
             # Останавливаем запись
             saved_files = self.audio_core.stop_recording()
             
+            # Повторная запись под тем же именем перезаписывает файлы, не меняя mtime папки -
+            # кэш списка записей сбрасываем явно
+            self._rec_list_cache = None
+            
             # Обновляем интерфейс
             self._stop_recording_ui()
             
             # Обновляем список записей
             self.refresh_recordings_list()
             
-            # Автоматический анализ если включен
+            self.status_var.set("✅ Запись завершена")
+            
+            # Автоматический анализ если включен (идет в фоне, статус обновит сам)
             if self.enable_analysis_var.get() and saved_files:
                 outside_path = saved_files.get('outside', {}).get('filepath')
                 inside_path = saved_files.get('inside', {}).get('filepath')
-                reference_text = self.reference_text_var.get() if self.enable_text_check_var.get() else None
+                reference_text = getattr(self, '_recording_reference_text', None)
                 
                 if outside_path and inside_path:
                     test_name = self.test_name_var.get()
                     self._analyze_recording(outside_path, inside_path, test_name, reference_text)
             
-            self.status_var.set("✅ Запись завершена")
-            
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка остановки записи: {e}")
             self._stop_recording_ui()
     
     def _stop_recording_ui(self):
         """Обновить интерфейс после остановки записи"""
+        # Отменяем запланированные обновления уровней и таймера
+        for attr in ('_level_after_id', '_timer_after_id'):
+            after_id = getattr(self, attr)
+            if after_id:
+                self.root.after_cancel(after_id)
+                setattr(self, attr, None)
+        
         self.record_btn.config(state=tk.NORMAL)
         self.stop_btn.config(state=tk.DISABLED)
         self.record_status.config(text="Ожидание", foreground="blue")
-        self.timer_label.config(text="00:00 / 00:00")
+        self.timer_var.set("00:00 / 00:00")
+        self._close_phrase_window()
         
         # Выключаем и скрываем индикаторы
         self.outside_indicator.set_active(False)
@@ -931,15 +1864,15 @@ class AdvancedSoundTester:
                 messagebox.showinfo("Устройства", "Устройства не найдены")
                 return
             
-            summary = "📊 Сводка по аудиоустройствам:\n\n"
-            for i, device in enumerate(devices):
-                summary += f"Устройство {i}:\n"
-                summary += f"  Название: {device['name']}\n"
-                summary += f"  Каналы: {device['channels']}\n"
-                summary += f"  Частота: {device.get('sample_rate', 'N/A')} Гц\n"
-                summary += "  ---\n"
-            
-            summary += f"\nВсего устройств: {len(devices)}"
+            device_lines = [
+                f"Устройство {i}:\n"
+                f"  Название: {device['name']}\n"
+                f"  Каналы: {device['channels']}\n"
+                f"  Частота: {device.get('sample_rate', 'N/A')} Гц\n"
+                "  ---\n"
+                for i, device in enumerate(devices)
+            ]
+            summary = "📊 Сводка по аудиоустройствам:\n\n" + "".join(device_lines) + f"\nВсего устройств: {len(devices)}"
             
             # Создаем отдельное окно для отображения
             summary_window = tk.Toplevel(self.root)
@@ -960,33 +1893,20 @@ class AdvancedSoundTester:
         """Вкладка анализа"""
         # Заголовок
         ttk.Label(parent, text="АНАЛИЗ ЗАПИСЕЙ (с защитой от спуфинга)", 
-                 font=('Arial', 12, 'bold')).pack(pady=10)
+                 style="Header.TLabel").pack(pady=10)
         
         # Список записей
         list_frame = ttk.LabelFrame(parent, text="Доступные записи", padding="10")
         list_frame.pack(fill=tk.BOTH, expand=True, pady=10)
         
         # TreeView
-        columns = ("name", "date", "duration", "size", "status", "engine", "text_check")
-        self.recordings_tree = ttk.Treeview(list_frame, columns=columns, show="headings", height=12)
-        
-        # Заголовки
-        self.recordings_tree.heading("name", text="Имя теста")
-        self.recordings_tree.heading("date", text="Дата")
-        self.recordings_tree.heading("duration", text="Длительность")
-        self.recordings_tree.heading("size", text="Размер")
-        self.recordings_tree.heading("status", text="Статус")
-        self.recordings_tree.heading("engine", text="Движок")
-        self.recordings_tree.heading("text_check", text="Проверка текста")
-        
-        # Ширина колонок
-        self.recordings_tree.column("name", width=180)
-        self.recordings_tree.column("date", width=140)
-        self.recordings_tree.column("duration", width=80)
-        self.recordings_tree.column("size", width=70)
-        self.recordings_tree.column("status", width=80)
-        self.recordings_tree.column("engine", width=100)
-        self.recordings_tree.column("text_check", width=120)
+        self.recordings_tree = ttk.Treeview(list_frame, columns=[c[0] for c in self.RECORDINGS_COLUMNS],
+                                            show="headings", height=12)
+        
+        # Заголовки и ширина колонок
+        for key, heading, width in self.RECORDINGS_COLUMNS:
+            self.recordings_tree.heading(key, text=heading)
+            self.recordings_tree.column(key, width=width)
         
         # Прокрутка
         scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.recordings_tree.yview)
@@ -1019,6 +1939,15 @@ class AdvancedSoundTester:
         self.result_text = scrolledtext.ScrolledText(result_frame, height=10, wrap=tk.WORD)
         self.result_text.pack(fill=tk.BOTH, expand=True)
         self.result_text.config(state=tk.DISABLED)
+        self._init_result_text_tags()
+    
+    def _init_result_text_tags(self):
+        """Настроить метки поля результатов (при выводе отчетов они только назначаются)"""
+        for tag, options in self.RESULT_TEXT_TAGS.items():
+            self.result_text.tag_config(tag, **options)
+        
+        for color in self.VERDICT_COLORS:
+            self.result_text.tag_config(f"verdict_{color}", font='AppSection', foreground=color)
     
     def setup_engine_tab(self, parent):
         """Вкладка настройки движков распознавания"""
@@ -1026,7 +1955,7 @@ class AdvancedSoundTester:
         engine_frame = ttk.LabelFrame(parent, text="Движок распознавания речи (ОФФЛАЙН)", padding="10")
         engine_frame.pack(fill=tk.X, pady=10)
         
-        ttk.Label(engine_frame, text="Выберите модель:", font=('Arial', 10)).grid(row=0, column=0, sticky=tk.W, pady=5)
+        ttk.Label(engine_frame, text="Выберите модель:", style="Body.TLabel").grid(row=0, column=0, sticky=tk.W, pady=5)
         
         # Список доступных движков
         self.engine_combo = ttk.Combobox(engine_frame, width=40, state="readonly")
@@ -1092,53 +2021,75 @@ class AdvancedSoundTester:
         self.test_result_text.grid(row=2, column=0, columnspan=3, pady=5, sticky="nsew")
         test_frame.columnconfigure(1, weight=1)
     
-    def _get_available_engines(self):
-        """Получение списка доступных движков"""
-        engines = []
+    def _get_models_snapshot(self):
+        """Множество установленных моделей (папки пересканируются только при изменении mtime)"""
+        try:
+            key = (os.stat("models/whisper").st_mtime_ns, os.stat("models/vosk").st_mtime_ns)
+        except OSError:
+            key = None
+        
+        cached = self._models_cache.get('models')
+        if key is not None and cached and cached[0] == key:
+            return cached[1]
+        
+        # Одно чтение каталога вместо stat() на каждую модель
+        def list_dir(path):
+            try:
+                with os.scandir(path) as entries:
+                    return {entry.name for entry in entries}
+            except OSError:
+                return set()
+        
+        whisper_files = list_dir("models/whisper")
+        vosk_dirs = list_dir("models/vosk")
+        
+        present = frozenset(
+            [f"whisper-{model}" for model in self.WHISPER_MODELS if f"{model}.pt" in whisper_files] +
+            [f"vosk-{model}" for model in self.VOSK_MODELS if model in vosk_dirs]
+        )
+        self._models_cache['models'] = (key, present)
+        return present
     
-        # Проверяем наличие моделей
-        # Whisper
-        whisper_models = []
-        for model in ["tiny", "base", "small", "medium"]:
-            if os.path.exists(f"models/whisper/{model}.pt"):
-                whisper_models.append(f"whisper-{model}")
+    def _get_recordings_wav_count(self):
+        """Количество WAV файлов в папке записей (None, если папки нет)"""
+        try:
+            key = os.stat(self.recordings_folder).st_mtime_ns
+        except OSError:
+            return None
+        
+        cached = self._models_cache.get('recordings')
+        if cached and cached[0] == key:
+            return cached[1]
+        
+        wav_count = sum(1 for f in os.listdir(self.recordings_folder) if f.endswith('.wav'))
+        self._models_cache['recordings'] = (key, wav_count)
+        return wav_count
     
-        # Vosk
-        vosk_models = []
-        for model in ["small-ru", "large-ru"]:
-            if os.path.exists(f"models/vosk/{model}"):
-                vosk_models.append(f"vosk-{model}")
+    def _scan_models(self):
+        """Установленные и отсутствующие модели (Whisper, затем Vosk)"""
+        models = self._get_models_snapshot()
+        available = []
+        missing = []
+        
+        for name in [f"whisper-{m}" for m in self.WHISPER_MODELS] + [f"vosk-{m}" for m in self.VOSK_MODELS]:
+            if name in models:
+                available.append(name)
+            else:
+                missing.append(name)
+        
+        return available, missing
     
-        # Добавляем все доступные
-        engines.extend(whisper_models)
-        engines.extend(vosk_models)
+    def _get_available_engines(self, available=None):
+        """Получение списка доступных движков"""
+        if available is None:
+            available, _ = self._scan_models()
     
         # Если нет моделей, показываем инструкцию
-        if not engines:
-            engines = ["⚠️ Нет моделей. Загрузите модели!"]
-    
-        return engines
+        return list(available) or ["⚠️ Нет моделей. Загрузите модели!"]
     
     def check_available_models(self):
         """Проверка доступных моделей"""
-        available = []
-        missing = []
-        
-        # Проверяем Whisper
-        for model in ["tiny", "small", "medium"]:
-            path = f"models/whisper/{model}.pt"
-            if os.path.exists(path):
-                available.append(f"whisper-{model}")
-            else:
-                missing.append(f"whisper-{model}")
-        
-        # Проверяем Vosk
-        for model in ["small-ru"]:
-            path = f"models/vosk/{model}"
-            if os.path.exists(path):
-                available.append(f"vosk-{model}")
-            else:
-                missing.append(f"vosk-{model}")
+        available, missing = self._scan_models()
         
         # Показываем результат
         result = "✅ Доступные модели:\n"
@@ -1160,7 +2111,7 @@ class AdvancedSoundTester:
         messagebox.showinfo("Проверка моделей", result)
         
         # Обновляем список в комбобоксе
-        engines = self._get_available_engines()
+        engines = self._get_available_engines(available)
         self.engine_combo['values'] = engines
         if engines and "⚠️" not in engines[0]:
             self.engine_combo.current(0)
@@ -1168,9 +2119,11 @@ class AdvancedSoundTester:
     def setup_export_tab(self, parent):
         """Вкладка генерации тестового датасета"""
     
-        if not DATASET_GENERATOR_AVAILABLE:
+        try:
+            _dataset_generator()
+        except ImportError:
             ttk.Label(parent, text="❌ Модуль генерации датасета не найден", 
-                    font=('Arial', 12, 'bold')).pack(pady=50)
+                    style="Header.TLabel").pack(pady=50)
             ttk.Label(parent, text="Создайте файл dataset_generator.py с кодом из предыдущего сообщения",
                     wraplength=800).pack(pady=20)
             return
@@ -1181,11 +2134,11 @@ class AdvancedSoundTester:
     
         ttk.Label(title_frame, 
             text="ГЕНЕРАЦИЯ ТЕСТОВОГО ДАТАСЕТА", 
-            font=('Arial', 14, 'bold')).pack()
+            style="Title.TLabel").pack()
     
         ttk.Label(title_frame, 
             text="Создание речевых записей с имитацией акустической обстановки защищаемого помещения",
-            font=('Arial', 10)).pack(pady=5)
+            style="Body.TLabel").pack(pady=5)
     
         # Вкладки
         notebook = ttk.Notebook(parent)
@@ -1203,59 +2156,89 @@ class AdvancedSoundTester:
     
     def update_system_info(self):
         """Обновление информации о системе"""
-        info = f"🧪 Sound Isolation Tester - Защита от спуфинг-атак\n"
-        info += f"📅 Дата: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        info += f"🐍 Python: {sys.version.split()[0]}\n"
-        info += f"💻 ОС: {sys.platform}\n"
-        info += f"📁 Папка проекта: {os.path.abspath('.')}\n"
+        parts = [
+            "🧪 Sound Isolation Tester - Защита от спуфинг-атак\n",
+            f"📅 Дата: {datetime.now():%Y-%m-%d %H:%M:%S}\n",
+            self._sysinfo_static,
+        ]
         
         # Подсчет записей
-        if os.path.exists(self.recordings_folder):
-            wav_files = [f for f in os.listdir(self.recordings_folder) if f.endswith('.wav')]
-            info += f"🎙️ Записей: {len(wav_files) // 2}\n"
+        wav_count = self._get_recordings_wav_count()
+        if wav_count is not None:
+            parts.append(f"🎙️ Записей: {wav_count // 2}\n")
         else:
-            info += f"🎙️ Записей: папка не найдена\n"
+            parts.append(f"🎙️ Записей: папка не найдена\n")
     
         # Проверка моделей
-        info += "\n🔍 Проверка моделей:\n"
+        parts.append("\n🔍 Проверка моделей:\n")
         models_found = 0
+        models = self._get_models_snapshot()
     
         # Whisper
         for model in ["tiny", "small", "medium"]:
-            if os.path.exists(f"models/whisper/{model}.pt"):
-                info += f"  ✅ Whisper {model}\n"
+            if f"whisper-{model}" in models:
+                parts.append(f"  ✅ Whisper {model}\n")
                 models_found += 1
             else:
-                info += f"  ❌ Whisper {model} (отсутствует)\n"
+                parts.append(f"  ❌ Whisper {model} (отсутствует)\n")
     
         # Vosk
-        if os.path.exists("models/vosk/small-ru"):
-            info += f"  ✅ Vosk small-ru\n"
+        if "vosk-small-ru" in models:
+            parts.append(f"  ✅ Vosk small-ru\n")
             models_found += 1
         else:
-            info += f"  ❌ Vosk small-ru (отсутствует)\n"
+            parts.append(f"  ❌ Vosk small-ru (отсутствует)\n")
     
-        info += f"\n📊 Всего моделей: {models_found}/2\n"
+        parts.append(f"\n📊 Всего моделей: {models_found}/2\n")
     
         if models_found >= 2:
-            info += "✅ Все модели готовы!"
+            parts.append("✅ Все модели готовы!")
         else:
-            info += "⚠️ Загрузите недостающие модели!"
+            parts.append("⚠️ Загрузите недостающие модели!")
     
-        self.system_info.delete(1.0, tk.END)
-        self.system_info.insert(1.0, info)
-        self.system_info.config(state=tk.DISABLED)
+        with _editable(self.system_info):
+            self.system_info.delete(1.0, tk.END)
+            self.system_info.insert(1.0, "".join(parts))
     
     def _analyze_recording(self, outside_path, inside_path, test_name, reference_text=None):
-        """Анализ записи"""
+        """Анализ записи в фоновом потоке; результат отображается в потоке Tk"""
         try:
             self.status_var.set("📊 Анализ записи...")
             
-            analysis = self.analyzer.analyze_with_audio_analysis(
+            future = self._analysis_executor.submit(
+                self._with_recognizer, self.analyzer.analyze_with_audio_analysis,
                 outside_path, inside_path, test_name,
                 reference_text=reference_text,
                 enable_speech_recognition=bool(self.recognizer)
             )
+            future.add_done_callback(lambda f: self._ui_queue.put((self._on_analysis_done, (f,))))
+            
+        except Exception as e:
+            self.status_var.set("❌ Ошибка анализа")
+            messagebox.showwarning("Предупреждение", f"Ошибка анализа: {e}")
+    
+    def _with_recognizer(self, func, *args, **kwargs):
+        """Выполнить func в рабочем потоке, дождавшись освобождения модели распознавания"""
+        with self._recognizer_lock:
+            return func(*args, **kwargs)
+    
+    def _try_lock_recognizer(self):
+        """Занять модель распознавания из потока Tk без ожидания.
+        
+        Если модель занята фоновым анализом или распознаванием - сообщаем и возвращаем False
+        (ждать замок в потоке Tk нельзя - интерфейс зависнет).
+        """
+        if self._recognizer_lock.acquire(blocking=False):
+            return True
+        messagebox.showinfo("Информация",
+            "Модель распознавания занята: идет анализ или распознавание записи.\n"
+            "Повторите после завершения.")
+        return False
+    
+    def _on_analysis_done(self, future):
+        """Завершение фонового анализа (поток Tk)"""
+        try:
+            analysis = future.result()
             
             # Показываем результаты
             self._display_analysis_results(analysis)
@@ -1268,203 +2251,237 @@ class AdvancedSoundTester:
     
     def _display_analysis_results(self, analysis):
         """Отобразить результаты анализа для аттестации помещения"""
-        try:
-            overall = analysis.get('results', {}).get('overall_assessment', {})
-            isolation = analysis.get('results', {}).get('isolation_assessment', {})
-            audio = analysis.get('results', {}).get('audio_analysis', {})
-            speech = analysis.get('results', {}).get('speech_recognition', {})
+        # Поле результатов находится на вкладке анализа
+        self._ensure_tab("analysis")
         
-            result_text = "=" * 70 + "\n"
-            result_text += f"АТТЕСТАЦИЯ ЗВУКОИЗОЛЯЦИИ ПОМЕЩЕНИЯ\n"
-            result_text += f"Тест: {analysis.get('test_name', 'N/A')}\n"
-            result_text += f"Время: {analysis.get('timestamp', 'N/A')}\n"
-            result_text += "=" * 70 + "\n\n"
+        try:
+            # Разделы результатов и поля общей оценки читаются из словарей один раз
+            results = analysis.get('results') or _EMPTY
+            overall = results.get('overall_assessment') or _EMPTY
+            isolation = results.get('isolation_assessment') or _EMPTY
+            audio = results.get('audio_analysis') or _EMPTY
+            verdict, color, summary = (overall.get('verdict', 'Н/Д'), overall.get('color', 'black'),
+                                       overall.get('summary', 'Н/Д'))
+            isolation_score, composite_grade = overall.get('isolation_score'), overall.get('composite_grade')
+        
+            parts = ["=" * 70 + "\n"]
+            parts.append(f"АТТЕСТАЦИЯ ЗВУКОИЗОЛЯЦИИ ПОМЕЩЕНИЯ\n")
+            parts.append(f"Тест: {analysis.get('test_name', 'N/A')}\n")
+            parts.append(f"Время: {analysis.get('timestamp', 'N/A')}\n")
+            parts.append("=" * 70 + "\n\n")
         
             # 1. ПРОВЕРКА ЭТАЛОНА (внутренняя запись)
-            result_text += "🔍 ПРОВЕРКА ВНУТРИ ПОМЕЩЕНИЯ:\n"
-            result_text += "-" * 40 + "\n"
-        
-            if isolation and 'inside_reference_check' in isolation:
-                inside_check = isolation['inside_reference_check']
+            parts.append("🔍 ПРОВЕРКА ВНУТРИ ПОМЕЩЕНИЯ:\n")
+            parts.append("-" * 40 + "\n")
+        
+            inside_check = isolation.get('inside_reference_check') if isolation else None
+            if inside_check is not None:
+                match_score = inside_check.get('match_score')
+                confidence = inside_check.get('confidence')
+                recognized = inside_check.get('recognized')
+                
                 if inside_check.get('valid', False):
-                    result_text += "✅ Речь распознана корректно\n"
+                    parts.append("✅ Речь распознана корректно\n")
                 else:
-                    result_text += "⚠️ Проблемы с распознаванием!\n"
-            
-                if 'match_score' in inside_check:
-                    result_text += f"   Совпадение с текстом: {inside_check.get('match_score', 0)*100:.1f}%\n"
-                if 'confidence' in inside_check:
-                    result_text += f"   Уверенность распознавания: {inside_check.get('confidence', 0)*100:.1f}%\n"
-            
-                if 'recognized' in inside_check and inside_check['recognized']:
-                    recognized = inside_check['recognized']
-                    if len(recognized) > 100:
-                        recognized = recognized[:100] + "..."
-                    result_text += f"   Распознанный текст: \"{recognized}\"\n"
+                    parts.append("⚠️ Проблемы с распознаванием!\n")
+            
+                if match_score is not None:
+                    parts.append(f"   Совпадение с текстом: {match_score*100:.1f}%\n")
+                if confidence is not None:
+                    parts.append(f"   Уверенность распознавания: {confidence*100:.1f}%\n")
+            
+                if recognized:
+                    parts.append(f"   Распознанный текст: \"{_clip(recognized, 100)}\"\n")
             else:
-                result_text += "ℹ️ Проверка не выполнена\n"
+                parts.append("ℹ️ Проверка не выполнена\n")
         
-            result_text += "\n"
+            parts.append("\n")
         
             # 2. ОЦЕНКА ЗВУКОИЗОЛЯЦИИ
-            result_text += "📊 ОЦЕНКА ЗВУКОИЗОЛЯЦИИ ПОМЕЩЕНИЯ:\n"
-            result_text += "-" * 40 + "\n"
+            parts.append("📊 ОЦЕНКА ЗВУКОИЗОЛЯЦИИ ПОМЕЩЕНИЯ:\n")
+            parts.append("-" * 40 + "\n")
         
             # 2.1 Оценка по громкости
-            if audio and 'level_comparison' in audio:
-                level_data = audio['level_comparison']
+            level_data = audio.get('level_comparison') if audio else None
+            if level_data is not None:
                 attenuation = level_data.get('attenuation_db', 0)
                 inside_rms = level_data.get('inside_rms', 0)
                 outside_rms = level_data.get('outside_rms', 0)
+                reduction_ratio = level_data.get('level_reduction_ratio')
             
-                result_text += f"🎚️ УРОВНИ ГРОМКОСТИ:\n"
-                result_text += f"   • Внутри (источник): {inside_rms:.4f}\n"
-                result_text += f"   • Снаружи (измерение): {outside_rms:.4f}\n"
-                result_text += f"   • Ослабление звука: {attenuation:.1f} дБ\n"
+                parts.append(f"🎚️ УРОВНИ ГРОМКОСТИ:\n")
+                parts.append(f"   • Внутри (источник): {inside_rms:.4f}\n")
+                parts.append(f"   • Снаружи (измерение): {outside_rms:.4f}\n")
+                parts.append(f"   • Ослабление звука: {attenuation:.1f} дБ\n")
             
-                if 'level_reduction_ratio' in level_data:
-                    reduction = level_data['level_reduction_ratio'] * 100
-                    result_text += f"   • Звука вышло наружу: {reduction:.1f}%\n"
+                if reduction_ratio is not None:
+                    reduction = reduction_ratio * 100
+                    parts.append(f"   • Звука вышло наружу: {reduction:.1f}%\n")
             
-                result_text += "\n"
+                parts.append("\n")
         
             # 2.2 Оценка по распознаванию речи
-            if isolation and 'isolation_metrics' in isolation:
-                iso_metrics = isolation['isolation_metrics']
-            
-                result_text += f"🗣️ ОЦЕНКА ПО РАСПОЗНАВАНИЮ РЕЧИ:\n"
-            
-                if 'inside_similarity' in iso_metrics and 'outside_similarity' in iso_metrics:
-                    inside_sim = iso_metrics['inside_similarity'] * 100
-                    outside_sim = iso_metrics['outside_similarity'] * 100
-                    result_text += f"   • Сходство с эталоном внутри: {inside_sim:.1f}%\n"
-                    result_text += f"   • Сходство с эталоном снаружи: {outside_sim:.1f}%\n"
+            iso_metrics = isolation.get('isolation_metrics') if isolation else None
+            if iso_metrics is not None:
+                inside_sim = iso_metrics.get('inside_similarity')
+                outside_sim = iso_metrics.get('outside_similarity')
+                total = iso_metrics.get('words_total')
+                leakage = iso_metrics.get('leakage_percentage')
+            
+                parts.append(f"🗣️ ОЦЕНКА ПО РАСПОЗНАВАНИЮ РЕЧИ:\n")
+            
+                if inside_sim is not None and outside_sim is not None:
+                    inside_sim *= 100
+                    outside_sim *= 100
+                    parts.append(f"   • Сходство с эталоном внутри: {inside_sim:.1f}%\n")
+                    parts.append(f"   • Сходство с эталоном снаружи: {outside_sim:.1f}%\n")
                 
                     if inside_sim > 0:
                         efficiency = (1 - (outside_sim / inside_sim)) * 100
-                        result_text += f"   • Эффективность изоляции: {efficiency:.1f}%\n"
+                        parts.append(f"   • Эффективность изоляции: {efficiency:.1f}%\n")
             
-                if 'words_total' in iso_metrics:
-                    total = iso_metrics['words_total']
+                if total is not None:
                     inside_words = iso_metrics.get('words_understood_inside', 0)
                     outside_words = iso_metrics.get('words_understood_outside', 0)
                     lost_words = iso_metrics.get('words_lost', 0)
                 
-                    result_text += f"\n   📝 АНАЛИЗ СЛОВ:\n"
-                    result_text += f"   • Всего слов в фразе: {total}\n"
-                    result_text += f"   • Слов распознано внутри: {inside_words}/{total} ({inside_words/total*100:.0f}%)\n"
-                    result_text += f"   • Слов распознано снаружи: {outside_words}/{total} ({outside_words/total*100:.0f}%)\n"
-                    result_text += f"   • Слов потеряно при изоляции: {lost_words}\n"
+                    parts.append(f"\n   📝 АНАЛИЗ СЛОВ:\n")
+                    parts.append(f"   • Всего слов в фразе: {total}\n")
+                    parts.append(f"   • Слов распознано внутри: {inside_words}/{total} ({inside_words/total*100:.0f}%)\n")
+                    parts.append(f"   • Слов распознано снаружи: {outside_words}/{total} ({outside_words/total*100:.0f}%)\n")
+                    parts.append(f"   • Слов потеряно при изоляции: {lost_words}\n")
             
-                if 'leakage_percentage' in iso_metrics:
-                    leakage = iso_metrics['leakage_percentage']
-                    result_text += f"\n   🔄 УТЕЧКА РЕЧИ: {leakage:.1f}%\n"
+                if leakage is not None:
+                    parts.append(f"\n   🔄 УТЕЧКА РЕЧИ: {leakage:.1f}%\n")
             
-                result_text += "\n"
+                parts.append("\n")
         
             # 3. ВЕРДИКТ
-            result_text += "🏆 ВЕРДИКТ АТТЕСТАЦИИ:\n"
-            result_text += "-" * 40 + "\n"
-            verdict = overall.get('verdict', 'Н/Д')
-            color = overall.get('color', 'black')
+            parts.append("🏆 ВЕРДИКТ АТТЕСТАЦИИ:\n")
+            parts.append("-" * 40 + "\n")
+            # Номер строки вердикта в Text (строки нумеруются с 1)
+            verdict_line = sum(part.count("\n") for part in parts) + 1
         
             # Создаем цветные метки
             if "ОТЛИЧНАЯ" in verdict:
-                result_text += f"🎉 {verdict}\n"
+                parts.append(f"🎉 {verdict}\n")
             elif "ХОРОШАЯ" in verdict:
-                result_text += f"✅ {verdict}\n"
+                parts.append(f"✅ {verdict}\n")
             elif "УДОВЛЕТВОРИТЕЛЬНАЯ" in verdict:
-                result_text += f"⚠️ {verdict}\n"
+                parts.append(f"⚠️ {verdict}\n")
             elif "СЛАБАЯ" in verdict or "НЕЭФФЕКТИВНАЯ" in verdict:
-                result_text += f"❌ {verdict}\n"
+                parts.append(f"❌ {verdict}\n")
             else:
-                result_text += f"{verdict}\n"
+                parts.append(f"{verdict}\n")
         
-            result_text += f"\n📋 Сводка: {overall.get('summary', 'Н/Д')}\n"
+            parts.append(f"\n📋 Сводка: {summary}\n")
         
-            if 'isolation_score' in overall:
-                result_text += f"🏅 Общая оценка: {overall.get('isolation_score', 0):.1f}/100\n"
+            if isolation_score is not None:
+                parts.append(f"🏅 Общая оценка: {isolation_score:.1f}/100\n")
         
-            if 'composite_grade' in overall:
-                result_text += f"📈 Оценка: {overall.get('composite_grade', 'Н/Д')}\n"
+            if composite_grade is not None:
+                parts.append(f"📈 Оценка: {composite_grade}\n")
         
-            result_text += "\n"
+            parts.append("\n")
         
             # 4. РЕКОМЕНДАЦИИ
             recommendations = overall.get('recommendations', [])
             if recommendations:
-                result_text += "💡 РЕКОМЕНДАЦИИ:\n"
-                result_text += "-" * 40 + "\n"
+                parts.append("💡 РЕКОМЕНДАЦИИ:\n")
+                parts.append("-" * 40 + "\n")
                 for i, rec in enumerate(recommendations, 1):
                     # Добавляем эмодзи в зависимости от типа рекомендации
-                    if "усилить" in rec.lower() or "установить" in rec.lower() or "проверить" in rec.lower():
-                        result_text += f"🔧 {i}. {rec}\n"
-                    elif "обнаружена" in rec.lower() or "требуется" in rec.lower():
-                        result_text += f"⚠️ {i}. {rec}\n"
-                    elif "соответствует" in rec.lower() or "отличная" in rec.lower():
-                        result_text += f"✅ {i}. {rec}\n"
+                    rec_lower = rec.lower()
+                    if "усилить" in rec_lower or "установить" in rec_lower or "проверить" in rec_lower:
+                        parts.append(f"🔧 {i}. {rec}\n")
+                    elif "обнаружена" in rec_lower or "требуется" in rec_lower:
+                        parts.append(f"⚠️ {i}. {rec}\n")
+                    elif "соответствует" in rec_lower or "отличная" in rec_lower:
+                        parts.append(f"✅ {i}. {rec}\n")
                     else:
-                        result_text += f"{i}. {rec}\n"
-        
-            result_text += "\n" + "=" * 70 + "\n"
-            result_text += f"💡 ПРИМЕЧАНИЕ ДЛЯ ЭКСПЕРТА:\n"
-            result_text += f"   Для точной аттестации рекомендуется:\n"
-            result_text += f"   1. Провести 3-5 измерений в разных точках\n"
-            result_text += f"   2. Использовать разные фразы для тестирования\n"
-            result_text += f"   3. Учесть фоновый шум помещения\n"
-            result_text += "=" * 70
-        
+                        parts.append(f"{i}. {rec}\n")
+        
+            parts.append("\n" + "=" * 70 + "\n")
+            parts.append(f"💡 ПРИМЕЧАНИЕ ДЛЯ ЭКСПЕРТА:\n")
+            parts.append(f"   Для точной аттестации рекомендуется:\n")
+            parts.append(f"   1. Провести 3-5 измерений в разных точках\n")
+            parts.append(f"   2. Использовать разные фразы для тестирования\n")
+            parts.append(f"   3. Учесть фоновый шум помещения\n")
+            parts.append("=" * 70)
+        
+            result_text = "".join(parts)
+            
+            # Цвет вердикта и заголовок (неизвестный цвет - черным)
+            verdict_tag = f"verdict_{color}" if color in self.VERDICT_COLORS else "verdict_black"
+            tag_ranges = {
+                verdict_tag: ["%d.0" % verdict_line, "%d.end" % verdict_line],
+                "header": ["1.0", "1.end"],
+            }
+            
             # Отображаем в интерфейсе
-            self.result_text.config(state=tk.NORMAL)
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, result_text)
-        
-            # Настраиваем цвет вердикта
-            start_line = result_text.split('\n').index("ВЕРДИКТ АТТЕСТАЦИИ:") + 2
-            line_start = f"{start_line}.0"
-            line_end = f"{start_line}.end"
-        
-            self.result_text.tag_add("verdict", line_start, line_end)
-            self.result_text.tag_config("verdict", foreground=color, font=('Arial', 11, 'bold'))
-        
-            # Добавляем цвет для заголовков
-            self.result_text.tag_add("header", "1.0", "1.end")
-            self.result_text.tag_config("header", font=('Arial', 12, 'bold'), foreground='darkblue')
-        
-            self.result_text.config(state=tk.DISABLED)
+            self._show_result_text(result_text, tag_ranges)
         
         except Exception as e:
             print(f"Ошибка отображения результатов: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Ошибка отображения результатов анализа")
         
             # Показываем хотя бы ошибку
-            self.result_text.config(state=tk.NORMAL)
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, f"Ошибка отображения результатов: {str(e)}")
-            self.result_text.config(state=tk.DISABLED)
+            self._show_result_text(f"Ошибка отображения результатов: {str(e)}")
+    
+    def _show_result_text(self, text, tag_ranges=None):
+        """Вывести отчет в поле результатов.
+        
+        Длинный отчет вставляется порциями из after_idle, чтобы окно не замирало;
+        метки (tag_ranges: имя -> список индексов начала/конца) назначаются после вставки всего текста.
+        """
+        widget = self.result_text
+        self._last_result_lines = text.splitlines()
+        
+        # Прерываем вывод предыдущего отчета, если он еще не закончен
+        if self._result_stream_id:
+            widget.after_cancel(self._result_stream_id)
+            self._result_stream_id = None
+        
+        def step(start=0):
+            # Короткий отчет уходит целиком за один шаг
+            end = len(text) if len(text) < self.RESULT_STREAM_THRESHOLD else start + self.RESULT_STREAM_CHUNK
+            
+            # Между порциями поле остается только для чтения
+            with _editable(widget):
+                if start == 0:
+                    widget.delete(1.0, tk.END)
+                widget.insert(tk.END, text[start:end])
+                
+                # С последней порцией назначаем все метки сразу, до возврата в режим только для чтения
+                if end >= len(text):
+                    self._result_stream_id = None
+                    tag_add = widget.tag_add
+                    for tag, ranges in (tag_ranges or {}).items():
+                        tag_add(tag, *ranges)
+                    return
+            
+            self._result_stream_id = widget.after_idle(step, end)
+        
+        step()
     
     def refresh_recordings_list(self):
         """Обновить список записей"""
+        # Вкладка анализа еще не построена - список заполнится при ее открытии
+        if "analysis" not in self._tabs_built:
+            return
+        
         try:
-            # Очищаем дерево
-            for item in self.recordings_tree.get_children():
-                self.recordings_tree.delete(item)
-            
-            # Получаем список записей
-            recordings = self._get_recordings_list()
-            
-            # Добавляем записи в дерево
-            for rec in recordings:
-                self.recordings_tree.insert("", tk.END, values=(
-                    rec.get('test_name', 'N/A'),
-                    rec.get('timestamp', 'N/A'),
-                    rec.get('duration', 'N/A'),
-                    rec.get('size', 'N/A'),
-                    rec.get('status', 'N/A'),
-                    rec.get('engine', 'N/A'),
-                    rec.get('text_check', 'N/A')
-                ))
+            # Получаем список записей и готовим строки заранее (порядок - как в RECORDINGS_COLUMNS)
+            fields = ('test_name', 'timestamp', 'duration', 'size', 'status', 'engine', 'text_check')
+            rows = [tuple(rec.get(field, 'N/A') for field in fields) for rec in self._get_recordings_list()]
+            
+            # Очищаем дерево одним вызовом
+            tree = self.recordings_tree
+            tree.delete(*tree.get_children())
+            
+            # Добавляем записи в дерево (перерисовка - один раз, после цикла)
+            for values in rows:
+                tree.insert("", tk.END, values=values)
             
         except Exception as e:
             print(f"Ошибка обновления списка записей: {e}")
@@ -1474,59 +2491,108 @@ class AdvancedSoundTester:
         recordings = []
         
         try:
-            # Сканируем папку recordings
-            for file in os.listdir(self.recordings_folder):
-                if file.endswith('_metadata.json'):
-                    metadata_path = os.path.join(self.recordings_folder, file)
-                    try:
-                        with open(metadata_path, 'r', encoding='utf-8') as f:
-                            metadata = json.load(f)
-                            
-                            # Определяем статус проверки текста
-                            text_check_status = "❓ Нет данных"
-                            analysis_file = os.path.join(self.recordings_folder, 
-                                                        f"{metadata.get('test_name', '')}_analysis.json")
-                            if os.path.exists(analysis_file):
-                                with open(analysis_file, 'r', encoding='utf-8') as af:
-                                    analysis_data = json.load(af)
-                                    text_val = analysis_data.get('results', {}).get('text_validation', {})
-                                    if text_val:
-                                        text_check_status = "✅ Проверен" if text_val.get('valid') else "❌ Не совпадает"
-                            
-                            # Формируем информацию о записи
-                            rec_info = {
-                                'test_name': metadata.get('test_name', file.replace('_metadata.json', '')),
-                                'timestamp': metadata.get('timestamp', 'N/A'),
-                                'duration': f"{metadata.get('duration', 0):.1f} сек",
-                                'size': self._get_recording_size(metadata),
-                                'status': '✅' if metadata.get('analysis_ready', False) else '⚠️',
-                                'engine': metadata.get('analysis_engine', 'N/A'),
-                                'text_check': text_check_status
-                            }
-                            recordings.append(rec_info)
-                            
-                    except Exception as e:
-                        print(f"Ошибка чтения {file}: {e}")
+            # Папка не менялась (файлы не добавлялись и не удалялись) - список прежний.
+            # Перезапись существующих файлов mtime папки не меняет: stop_recording сбрасывает кэш сам
+            folder_mtime = os.stat(self.recordings_folder).st_mtime_ns
+            if self._rec_list_cache and self._rec_list_cache[0] == folder_mtime:
+                return self._rec_list_cache[1]
+            
+            # Один проход по папке recordings: имя -> DirEntry (stat берется из записи)
+            with os.scandir(self.recordings_folder) as it:
+                entries = {entry.name: entry for entry in it if entry.is_file()}
+            self._known_files = set(entries)
+            
+            meta_names = [name for name in entries if name.endswith('_metadata.json')]
+            
+            # Размеры файлов папки - один раз, из stat записей scandir
+            sizes = {name: entry.stat().st_size for name, entry in entries.items()}
+            
+            # Файлы записей независимы - читаем их параллельно, чтобы ввод-вывод перекрывался
+            if meta_names:
+                with ThreadPoolExecutor(max_workers=min(16, len(meta_names))) as executor:
+                    results = executor.map(partial(self._load_one_recording, entries=entries, sizes=sizes), meta_names)
+                    recordings = [rec_info for rec_info in results if rec_info]
+            
+            # Из кэша JSON убираем файлы, которых в папке больше нет (удалены или переименованы)
+            live_paths = {entry.path for entry in entries.values()}
+            for path in self._meta_cache.keys() - live_paths:
+                del self._meta_cache[path]
             
             # Сортируем по дате (сначала новые)
-            recordings.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+            recordings.sort(key=itemgetter('_sort_key'), reverse=True)
+            
+            self._rec_list_cache = (folder_mtime, recordings)
             
         except Exception as e:
             print(f"Ошибка получения списка записей: {e}")
         
-        return recordings
+        return recordings
+    
+    def _load_one_recording(self, file, entries, sizes):
+        """Прочитать метаданные одной записи (None при ошибке)"""
+        try:
+            entry = entries[file]
+            metadata = self._load_json_cached(entry.path, entry.stat(), self.RECORDING_META_FIELDS)
+            
+            test_name = metadata.get('test_name')
+            
+            # Определяем статус проверки текста
+            text_check_status = "❓ Нет данных"
+            analysis_entry = entries.get(f"{test_name or ''}_analysis.json")
+            if analysis_entry is not None:
+                analysis_data = self._load_json_cached(analysis_entry.path, analysis_entry.stat())
+                text_val = (analysis_data.get('results') or _EMPTY).get('text_validation')
+                if text_val:
+                    text_check_status = "✅ Проверен" if text_val.get('valid') else "❌ Не совпадает"
+            
+            timestamp = metadata.get('timestamp', 'N/A')
+            
+            # Формируем информацию о записи
+            return {
+                'test_name': test_name if test_name is not None else file[:-len('_metadata.json')],
+                'timestamp': timestamp,
+                '_sort_key': _parse_timestamp(timestamp),
+                'duration': f"{metadata.get('duration', 0):.1f} сек",
+                'size': self._get_recording_size(metadata, sizes),
+                'status': '✅' if metadata.get('analysis_ready', False) else '⚠️',
+                'engine': metadata.get('analysis_engine', 'N/A'),
+                'text_check': text_check_status
+            }
+            
+        except Exception as e:
+            print(f"Ошибка чтения {file}: {e}")
+            return None
+    
+    def _load_json_cached(self, path, st=None, fields=None):
+        """Прочитать JSON-файл записи; неизмененные файлы берутся из кэша без разбора.
+        
+        Если указаны fields, большой файл разбирается частично (только эти ключи).
+        """
+        if st is None:
+            st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        
+        cached = self._meta_cache.get(path)
+        if cached and cached[:2] == key:
+            return cached[2]
+        
+        with open(path, 'rb') as f:
+            if fields and IJSON_AVAILABLE and st.st_size >= self.PARTIAL_PARSE_MIN_SIZE:
+                data = _parse_json_fields(f, fields)
+            else:
+                data = _json_loads(f.read())
+        
+        self._meta_cache[path] = key + (data,)
+        return data
     
-    def _get_recording_size(self, metadata):
-        """Получить размер записи"""
+    def _get_recording_size(self, metadata, sizes):
+        """Получить размер записи (sizes - размеры файлов папки записей по имени)"""
         try:
-            files = metadata.get('files', {})
-            total_size = 0
-            
-            for channel in ['outside', 'inside']:
-                file_info = files.get(channel, {})
-                filepath = file_info.get('filepath')
-                if filepath and os.path.exists(filepath):
-                    total_size += os.path.getsize(filepath)
+            files = metadata.get('files') or _EMPTY
+            total_size = sum(
+                sizes.get(os.path.basename((files.get(channel) or _EMPTY).get('filepath') or ''), 0)
+                for channel in ('outside', 'inside')
+            )
             
             # Конвертируем в КБ/МБ
             if total_size > 1024 * 1024:
@@ -1547,43 +2613,38 @@ class AdvancedSoundTester:
             
             # Получаем данные выбранной записи
             item = self.recordings_tree.item(selection[0])
-            test_name = item['values'][0]
+            test_name = str(item['values'][0])  # ttk возвращает числовые имена ("101") как int
             
-            # Находим файлы записи
-            outside_path = os.path.join(self.recordings_folder, f"{test_name}_outside.wav")
-            inside_path = os.path.join(self.recordings_folder, f"{test_name}_inside.wav")
+            # Находим файлы записи (все пути строятся от общего префикса)
+            prefix = os.path.join(self.recordings_folder, test_name)
+            outside_path = f"{prefix}_outside.wav"
+            inside_path = f"{prefix}_inside.wav"
             
-            if not os.path.exists(outside_path) or not os.path.exists(inside_path):
+            # Наличие файлов - по последнему сканированию папки, без лишних stat
+            known = self._known_files
+            if f"{test_name}_outside.wav" not in known or f"{test_name}_inside.wav" not in known:
                 messagebox.showerror("Ошибка", "Файлы записи не найдены")
                 return
             
             # Читаем метаданные для получения текста
             reference_text = None
-            metadata_path = os.path.join(self.recordings_folder, f"{test_name}_metadata.json")
-            if os.path.exists(metadata_path):
+            metadata_path = f"{prefix}_metadata.json"
+            if f"{test_name}_metadata.json" in known:
                 with open(metadata_path, 'r', encoding='utf-8') as f:
                     metadata = json.load(f)
                     reference_text = metadata.get('reference_text')
             
-            # Выполняем анализ
-            self.status_var.set("📊 Анализ записи...")
-            
-            analysis = self.analyzer.analyze_with_audio_analysis(
-                outside_path, inside_path, test_name,
-                reference_text=reference_text,
-                enable_speech_recognition=bool(self.recognizer)
-            )
-            
-            # Отображаем результаты
-            self._display_analysis_results(analysis)
-            
-            self.status_var.set("✅ Анализ завершен")
+            # Выполняем анализ (в фоне, окно остается отзывчивым)
+            self._analyze_recording(outside_path, inside_path, test_name, reference_text)
             
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка анализа: {e}")
     
-    def recognize_speech(self):
-        """Распознавание речи для оценки звукоизоляции помещения с проверкой спуфинга"""
+    def recognize_speech(self, on_done=None):
+        """Распознавание речи для оценки звукоизоляции помещения с проверкой спуфинга.
+        
+        on_done вызывается в потоке Tk после успешного вывода результатов.
+        """
         try:
             if not self.recognizer:
                 messagebox.showwarning("Предупреждение", 
@@ -1599,20 +2660,23 @@ class AdvancedSoundTester:
     
             # Получаем данные выбранной записи
             item = self.recordings_tree.item(selection[0])
-            test_name = item['values'][0]
+            test_name = str(item['values'][0])  # ttk возвращает числовые имена ("101") как int
     
-            # Находим файлы записи
-            outside_path = os.path.join(self.recordings_folder, f"{test_name}_outside.wav")
-            inside_path = os.path.join(self.recordings_folder, f"{test_name}_inside.wav")
+            # Находим файлы записи (все пути строятся от общего префикса)
+            prefix = os.path.join(self.recordings_folder, test_name)
+            outside_path = f"{prefix}_outside.wav"
+            inside_path = f"{prefix}_inside.wav"
     
-            if not os.path.exists(outside_path) or not os.path.exists(inside_path):
+            # Наличие файлов - по последнему сканированию папки, без лишних stat
+            known = self._known_files
+            if f"{test_name}_outside.wav" not in known or f"{test_name}_inside.wav" not in known:
                 messagebox.showerror("Ошибка", "Файлы записи не найдены")
                 return
     
             # Получаем эталонный текст из метаданных
             reference_text = None
-            metadata_path = os.path.join(self.recordings_folder, f"{test_name}_metadata.json")
-            if os.path.exists(metadata_path):
+            metadata_path = f"{prefix}_metadata.json"
+            if f"{test_name}_metadata.json" in known:
                 with open(metadata_path, 'r', encoding='utf-8') as f:
                     metadata = json.load(f)
                     reference_text = metadata.get('reference_text')
@@ -1644,49 +2708,45 @@ class AdvancedSoundTester:
             # Распознавание речи
             self.status_var.set("🎤 Распознавание речи для оценки изоляции...")
     
-            # Показываем прогресс
-            progress_window = tk.Toplevel(self.root)
-            progress_window.title("Распознавание речи" + (" с проверкой спуфинга" if need_spoofing_check else ""))
-            progress_window.geometry("400x200")
-            progress_window.transient(self.root)
-            progress_window.grab_set()
-    
-            # Центрируем
-            progress_window.update_idletasks()
-            x = (self.root.winfo_screenwidth() // 2) - (400 // 2)
-            y = (self.root.winfo_screenheight() // 2) - (200 // 2)
-            progress_window.geometry(f'400x200+{x}+{y}')
-    
-            ttk.Label(progress_window, text="🔄 Распознавание речи..." + 
-                     ("\n(с проверкой спуфинга)" if need_spoofing_check else ""),
-                    font=('Arial', 12, 'bold')).pack(pady=20)
-    
-            progress_var = tk.StringVar(value="Начинаю распознавание...")
-            ttk.Label(progress_window, textvariable=progress_var).pack()
+            # Показываем прогресс (окно создается один раз и переиспользуется)
+            progress_run, progress_var = self._show_progress_window(
+                "Распознавание речи" + (" с проверкой спуфинга" if need_spoofing_check else ""),
+                "🔄 Распознавание речи..." + ("\n(с проверкой спуфинга)" if need_spoofing_check else ""),
+                "Начинаю распознавание..."
+            )
     
             # Запускаем в отдельном потоке
             result_container = []
             spoofing_result_container = []
+            audio_analysis_container = []
     
             def recognize_thread():
                 try:
-                    # Распознаем речь в обоих файлах
-                    progress_var.set("Распознаю внутреннюю запись...")
-                    inside_result = self.recognizer.transcribe(inside_path)
-                
-                    progress_var.set("Распознаю внешнюю запись...")
-                    outside_result = self.recognizer.transcribe(outside_path)
-                
-                    # Получаем результаты сравнения
-                    result = self.recognizer.analyze_pair(outside_path, inside_path, reference_text)
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        # Аудиоанализ (дБ) не зависит от распознавания - считаем его параллельно
+                        audio_future = executor.submit(
+                            self.analyzer._perform_audio_analysis, outside_path, inside_path
+                        )
+                    
+                        # analyze_pair сам распознает обе записи - отдельные transcribe не нужны
+                        progress_var.set("Распознаю внутреннюю и внешнюю записи...")
+                        result = self._with_recognizer(
+                            self.recognizer.analyze_pair, outside_path, inside_path, reference_text
+                        )
+                        audio_analysis = audio_future.result()
+                    
+                    # Результат публикуется, только когда обе задачи успешны: при ошибке любой
+                    # из них первым (и единственным) элементом будет {'error': ...}
+                    audio_analysis_container.append(audio_analysis)
                     result_container.append(result)
                 
                     # Если нужно проверить спуфинг
+                    inside_result = result.get('inside', {})
                     if need_spoofing_check and reference_text and inside_result:
                         progress_var.set("Проверка спуфинга...")
                     
                         # Сравниваем распознанную речь с эталоном
-                        match_score = self._calculate_text_match(inside_result.text, reference_text)
+                        match_score = self._calculate_text_match(inside_result.get('text', ''), reference_text)
                         passed = match_score >= 0.8  # 80% порог
                     
                         spoofing_result = {
@@ -1694,30 +2754,29 @@ class AdvancedSoundTester:
                             'success': True,
                             'test_name': test_name,
                             'reference_text': reference_text,
-                            'recognized_text': inside_result.text,
+                            'recognized_text': inside_result.get('text', ''),
                             'match_score': match_score,
                             'match_percent': match_score * 100,
                             'passed': passed,
                             'threshold': 0.8,
-                            'confidence': inside_result.confidence if hasattr(inside_result, 'confidence') else 0,
+                            'confidence': inside_result.get('confidence', 0),
                             'engine': result.get('engine', 'N/A')
                         }
                         spoofing_result_container.append(spoofing_result)
                 
                     progress_var.set("✅ Распознавание завершено")
-                    time.sleep(1)
-                    progress_window.destroy()
                 
                 except Exception as e:
                     progress_var.set(f"❌ Ошибка: {str(e)[:50]}")
                     result_container.append({'error': str(e)})
-                    time.sleep(2)
-                    progress_window.destroy()
+                
+                # Окно скрывается в потоке Tk; текст ошибки затем показывает messagebox
+                self._ui_queue.put((self._hide_progress_window, (progress_run,)))
     
             threading.Thread(target=recognize_thread, daemon=True).start()
     
-            # Ждем завершения
-            self.root.wait_window(progress_window)
+            # Ждем завершения (или закрытия окна пользователем)
+            self.root.wait_variable(self._progress_done_var)
     
             if not result_container:
                 messagebox.showerror("Ошибка", "Распознавание не выполнено")
@@ -1752,8 +2811,8 @@ class AdvancedSoundTester:
                 'comparison': result.get('comparison', {})
             }
     
-            # Получаем аудиоанализ для правильного расчета дБ
-            audio_analysis = self.analyzer._perform_audio_analysis(outside_path, inside_path)
+            # Аудиоанализ для правильного расчета дБ (посчитан параллельно с распознаванием)
+            audio_analysis = audio_analysis_container[0]
     
             # Оцениваем изоляцию помещения
             isolation_assessment = self.analyzer._assess_room_isolation(
@@ -1761,112 +2820,112 @@ class AdvancedSoundTester:
             )
     
             # 4. Отображаем результаты для аттестации с проверкой спуфинга
-            result_text = "=" * 70 + "\n"
-            result_text += f"ОЦЕНКА ЗВУКОИЗОЛЯЦИИ ПО РАСПОЗНАВАНИЮ РЕЧИ\n"
-            result_text += f"Тест: {test_name}\n"
-            result_text += f"Движок: {result.get('engine', 'N/A')}\n"
+            parts = ["=" * 70 + "\n"]
+            parts.append(f"ОЦЕНКА ЗВУКОИЗОЛЯЦИИ ПО РАСПОЗНАВАНИЮ РЕЧИ\n")
+            parts.append(f"Тест: {test_name}\n")
+            parts.append(f"Движок: {result.get('engine', 'N/A')}\n")
         
             # Добавляем информацию о проверке спуфинга
             if spoofing_result_container:
                 spoofing_result = spoofing_result_container[0]
-                result_text += f"Проверка спуфинга: {'✅ ВКЛЮЧЕНА' if spoofing_result.get('success') else '❌ ОШИБКА'}\n"
+                parts.append(f"Проверка спуфинга: {'✅ ВКЛЮЧЕНА' if spoofing_result.get('success') else '❌ ОШИБКА'}\n")
             elif reference_text:
-                result_text += f"Проверка спуфинга: ℹ️ ВЫПОЛНЕНА (через анализатор)\n"
+                parts.append(f"Проверка спуфинга: ℹ️ ВЫПОЛНЕНА (через анализатор)\n")
             else:
-                result_text += f"Проверка спуфинга: ⚠️ НЕ ВЫПОЛНЕНА (нет эталонной фразы)\n"
+                parts.append(f"Проверка спуфинга: ⚠️ НЕ ВЫПОЛНЕНА (нет эталонной фразы)\n")
             
-            result_text += "=" * 70 + "\n\n"
+            parts.append("=" * 70 + "\n\n")
     
+            # Строки заголовков разделов запоминаются при сборке текста (для цветных меток)
+            section_lines = []
+            audio_tag = "section_audio_ok"
+            if spoofing_result_container and not spoofing_result_container[0].get('passed', False):
+                audio_tag = "section_audio_err"
+            
+            def next_line(skip=0):
+                """Номер строки Text, на которую попадет следующий фрагмент (+ skip пустых строк)"""
+                return sum(part.count("\n") for part in parts) + 1 + skip
+            
             # 4.1 Проверка эталона (внутри) и спуфинга
-            result_text += "🔍 ПРОВЕРКА АУДИО ВНУТРИ ПОМЕЩЕНИЯ:\n"
-            result_text += "-" * 40 + "\n"
+            section_lines.append((audio_tag, next_line()))
+            parts.append("🔍 ПРОВЕРКА АУДИО ВНУТРИ ПОМЕЩЕНИЯ:\n")
+            parts.append("-" * 40 + "\n")
         
             # Если есть проверка спуфинга, показываем её
             if spoofing_result_container:
                 spoofing_result = spoofing_result_container[0]
                 if spoofing_result.get('success'):
                     if spoofing_result.get('passed'):
-                        result_text += "✅ СПУФИНГ-АТАКА НЕ ОБНАРУЖЕНА\n"
+                        parts.append("✅ СПУФИНГ-АТАКА НЕ ОБНАРУЖЕНА\n")
                     else:
-                        result_text += "❌ ВОЗМОЖНА СПУФИНГ-АТАКА!\n"
+                        parts.append("❌ ВОЗМОЖНА СПУФИНГ-АТАКА!\n")
                 
-                    result_text += f"   Совпадение с эталоном: {spoofing_result.get('match_percent', 0):.1f}%\n"
-                    result_text += f"   Порог прохождения: {spoofing_result.get('threshold', 0)*100}%\n"
-                    result_text += f"   Уверенность распознавания: {spoofing_result.get('confidence', 0)*100:.1f}%\n"
+                    parts.append(f"   Совпадение с эталоном: {spoofing_result.get('match_percent', 0):.1f}%\n")
+                    parts.append(f"   Порог прохождения: {spoofing_result.get('threshold', 0)*100}%\n")
+                    parts.append(f"   Уверенность распознавания: {spoofing_result.get('confidence', 0)*100:.1f}%\n")
                 
                     # Показываем фразы
-                    ref_text = spoofing_result.get('reference_text', '')
-                    if len(ref_text) > 80:
-                        ref_text = ref_text[:77] + "..."
-                    result_text += f"   Эталонная фраза: \"{ref_text}\"\n"
+                    ref_text = _clip(spoofing_result.get('reference_text', ''), 80, 77)
+                    parts.append(f"   Эталонная фраза: \"{ref_text}\"\n")
                 
-                    rec_text = spoofing_result.get('recognized_text', '')
-                    if len(rec_text) > 80:
-                        rec_text = rec_text[:77] + "..."
-                    result_text += f"   Распознанная фраза: \"{rec_text}\"\n"
+                    rec_text = _clip(spoofing_result.get('recognized_text', ''), 80, 77)
+                    parts.append(f"   Распознанная фраза: \"{rec_text}\"\n")
                 
                     # Рекомендации по спуфингу
                     if not spoofing_result.get('passed', False):
-                        result_text += "\n   ⚠️ РЕКОМЕНДАЦИИ ПО СПУФИНГУ:\n"
+                        section_lines.append(("section_recommendations", next_line(1)))
+                        parts.append("\n   ⚠️ РЕКОМЕНДАЦИИ ПО СПУФИНГУ:\n")
                         if spoofing_result.get('match_percent', 0) >= 60:
-                            result_text += "   • Возможны ошибки распознавания\n"
-                            result_text += "   • Повторите запись с более четкой речью\n"
+                            parts.append("   • Возможны ошибки распознавания\n")
+                            parts.append("   • Повторите запись с более четкой речью\n")
                         else:
-                            result_text += "   • Высокая вероятность спуфинг-атаки\n"
-                            result_text += "   • Проверьте источник звука\n"
-                            result_text += "   • Убедитесь, что используется живая речь\n"
+                            parts.append("   • Высокая вероятность спуфинг-атаки\n")
+                            parts.append("   • Проверьте источник звука\n")
+                            parts.append("   • Убедитесь, что используется живая речь\n")
             elif inside_validation:
                 if inside_validation.get('valid', False):
-                    result_text += "✅ Речь распознана корректно\n"
+                    parts.append("✅ Речь распознана корректно\n")
                 else:
-                    result_text += "⚠️ Проблемы с распознаванием!\n"
+                    parts.append("⚠️ Проблемы с распознаванием!\n")
         
-                result_text += f"   Совпадение с текстом: {inside_validation.get('match_score', 0)*100:.1f}%\n"
-                result_text += f"   Уверенность распознавания: {inside_validation.get('confidence', 0)*100:.1f}%\n"
+                parts.append(f"   Совпадение с текстом: {inside_validation.get('match_score', 0)*100:.1f}%\n")
+                parts.append(f"   Уверенность распознавания: {inside_validation.get('confidence', 0)*100:.1f}%\n")
         
-                if 'recognized' in inside_validation and inside_validation['recognized']:
-                    recognized = inside_validation['recognized']
-                    if len(recognized) > 80:
-                        recognized = recognized[:80] + "..."
-                    result_text += f"   Распознанный текст: \"{recognized}\"\n"
+                recognized = inside_validation.get('recognized')
+                if recognized:
+                    parts.append(f"   Распознанный текст: \"{_clip(recognized, 80)}\"\n")
             else:
-                result_text += "ℹ️ Проверка эталона не выполнена\n"
+                parts.append("ℹ️ Проверка эталона не выполнена\n")
     
-            result_text += "\n"
+            parts.append("\n")
     
             # 4.2 Что распознано внутри и снаружи
-            result_text += "📝 РАСПОЗНАННЫЕ ТЕКСТЫ:\n"
-            result_text += "-" * 40 + "\n"
+            section_lines.append(("section_texts", next_line()))
+            parts.append("📝 РАСПОЗНАННЫЕ ТЕКСТЫ:\n")
+            parts.append("-" * 40 + "\n")
     
-            result_text += f"🎤 ВНУТРИ: \n"
+            parts.append(f"🎤 ВНУТРИ: \n")
             if inside_text:
-                if len(inside_text) > 100:
-                    inside_display = inside_text[:100] + "..."
-                else:
-                    inside_display = inside_text
-                result_text += f"   \"{inside_display}\"\n"
-                result_text += f"   Уверенность: {inside_confidence:.2f}\n"
-                result_text += f"   Слов: {len(inside_text.split())}\n"
+                parts.append(f"   \"{_clip(inside_text, 100)}\"\n")
+                parts.append(f"   Уверенность: {inside_confidence:.2f}\n")
+                parts.append(f"   Слов: {len(inside_text.split())}\n")
             else:
-                result_text += "   ❌ Не распознано\n"
+                parts.append("   ❌ Не распознано\n")
     
-            result_text += f"\n📡 СНАРУЖИ (тест изоляции):\n"
+            parts.append(f"\n📡 СНАРУЖИ (тест изоляции):\n")
             if outside_text:
-                if len(outside_text) > 100:
-                    outside_display = outside_text[:100] + "..."
-                else:
-                    outside_display = outside_text
-                result_text += f"   \"{outside_display}\"\n"
-                result_text += f"   Уверенность: {outside_confidence:.2f}\n"
-                result_text += f"   Слов: {len(outside_text.split())}\n"
+                parts.append(f"   \"{_clip(outside_text, 100)}\"\n")
+                parts.append(f"   Уверенность: {outside_confidence:.2f}\n")
+                parts.append(f"   Слов: {len(outside_text.split())}\n")
             else:
-                result_text += "   ✅ Не распознано (хорошая изоляция!)\n"
+                parts.append("   ✅ Не распознано (хорошая изоляция!)\n")
     
-            result_text += "\n"
+            parts.append("\n")
     
             # 4.3 Оценка изоляции
-            result_text += "📊 ОЦЕНКА ЗВУКОИЗОЛЯЦИИ ПО РАСПОЗНАВАНИЮ:\n"
-            result_text += "-" * 40 + "\n"
+            section_lines.append(("section_isolation", next_line()))
+            parts.append("📊 ОЦЕНКА ЗВУКОИЗОЛЯЦИИ ПО РАСПОЗНАВАНИЮ:\n")
+            parts.append("-" * 40 + "\n")
     
             if isolation_assessment and 'isolation_metrics' in isolation_assessment:
                 iso_metrics = isolation_assessment['isolation_metrics']
@@ -1876,22 +2935,15 @@ class AdvancedSoundTester:
                     inside_sim = iso_metrics['inside_similarity'] * 100
                     outside_sim = iso_metrics['outside_similarity'] * 100
             
-                    result_text += f"   Сходство с эталоном:\n"
-                    result_text += f"   • Внутри: {inside_sim:.1f}%\n"
-                    result_text += f"   • Снаружи: {outside_sim:.1f}%\n"
+                    parts.append(f"   Сходство с эталоном:\n")
+                    parts.append(f"   • Внутри: {inside_sim:.1f}%\n")
+                    parts.append(f"   • Снаружи: {outside_sim:.1f}%\n")
             
                     if inside_sim > 0:
                         efficiency = (1 - (outside_sim / inside_sim)) * 100
-                        result_text += f"   • Эффективность изоляции: {efficiency:.1f}%\n\n"
+                        parts.append(f"   • Эффективность изоляции: {efficiency:.1f}%\n\n")
                 
-                        if efficiency > 70:
-                            result_text += f"   🎉 ОТЛИЧНАЯ изоляция!\n"
-                        elif efficiency > 50:
-                            result_text += f"   ✅ ХОРОШАЯ изоляция\n"
-                        elif efficiency > 30:
-                            result_text += f"   ⚠️ УДОВЛЕТВОРИТЕЛЬНАЯ изоляция\n"
-                        else:
-                            result_text += f"   ❌ СЛАБАЯ изоляция\n"
+                        parts.append(f"   {_efficiency_verdict(efficiency)}\n")
         
                 # Оценка по словам
                 if 'words_total' in iso_metrics:
@@ -1900,72 +2952,58 @@ class AdvancedSoundTester:
                     outside_words = iso_metrics.get('words_understood_outside', 0)
                     lost_words = iso_metrics.get('words_lost', 0)
             
-                    result_text += f"\n   📝 АНАЛИЗ СЛОВ:\n"
-                    result_text += f"   • Всего слов: {total}\n"
-                    result_text += f"   • Распознано внутри: {inside_words}/{total} ({inside_words/total*100:.0f}%)\n"
-                    result_text += f"   • Распознано снаружи: {outside_words}/{total} ({outside_words/total*100:.0f}%)\n"
-                    result_text += f"   • Слов потеряно: {lost_words}\n"
-            
-                    if lost_words == 0 and outside_words == 0:
-                        result_text += f"   🎉 Идеальная изоляция - снаружи ничего не слышно!\n"
-                    elif lost_words > total * 0.5:
-                        result_text += f"   ✅ Хорошая изоляция - потеряно более половины слов\n"
-                    elif lost_words > 0:
-                        result_text += f"   ⚠️ Умеренная изоляция\n"
-                    else:
-                        result_text += f"   ❌ Слабая изоляция - все слова слышны снаружи\n"
+                    parts.append(f"\n   📝 АНАЛИЗ СЛОВ:\n")
+                    parts.append(f"   • Всего слов: {total}\n")
+                    parts.append(f"   • Распознано внутри: {inside_words}/{total} ({inside_words/total*100:.0f}%)\n")
+                    parts.append(f"   • Распознано снаружи: {outside_words}/{total} ({outside_words/total*100:.0f}%)\n")
+                    parts.append(f"   • Слов потеряно: {lost_words}\n")
+            
+                    parts.append(f"   {_word_loss_verdict(lost_words, outside_words, total)}\n")
         
                 # Оценка по дБ (из аудиоанализа)
                 if 'attenuation_db' in iso_metrics:
                     attenuation = iso_metrics['attenuation_db']
-                    result_text += f"\n   🔊 ОСЛАБЛЕНИЕ ЗВУКА: {attenuation:.1f} дБ\n"
-            
-                    if attenuation >= 50:
-                        result_text += f"   🎉 Отличная звукоизоляция!\n"
-                    elif attenuation >= 40:
-                        result_text += f"   ✅ Хорошая звукоизоляция\n"
-                    elif attenuation >= 30:
-                        result_text += f"   ⚠️ Удовлетворительная изоляция\n"
-                    elif attenuation >= 20:
-                        result_text += f"   ⚠️ Слабая изоляция\n"
-                    else:
-                        result_text += f"   ❌ Неэффективная изоляция\n"
+                    parts.append(f"\n   🔊 ОСЛАБЛЕНИЕ ЗВУКА: {attenuation:.1f} дБ\n")
+            
+                    parts.append(f"   {_attenuation_verdict(attenuation)}\n")
     
             # 4.4 Сравнительные метрики
             if 'comparison' in result:
                 comparison = result['comparison']
                 if 'wer' in comparison:
                     wer = comparison['wer']
-                    result_text += f"\n📈 СРАВНИТЕЛЬНЫЕ МЕТРИКИ:\n"
-                    result_text += f"-" * 40 + "\n"
-                    result_text += f"   WER (ошибок на слово): {wer:.2%}\n"
+                    section_lines.append(("section_metrics", next_line(1)))
+                    parts.append(f"\n📈 СРАВНИТЕЛЬНЫЕ МЕТРИКИ:\n")
+                    parts.append(f"-" * 40 + "\n")
+                    parts.append(f"   WER (ошибок на слово): {wer:.2%}\n")
             
                     if wer > 0.8:
-                        result_text += f"   ✅ Отличная изоляция (высокий WER)\n"
+                        parts.append(f"   ✅ Отличная изоляция (высокий WER)\n")
                     elif wer > 0.6:
-                        result_text += f"   ✅ Хорошая изоляция\n"
+                        parts.append(f"   ✅ Хорошая изоляция\n")
                     elif wer > 0.4:
-                        result_text += f"   ⚠️ Умеренная изоляция\n"
+                        parts.append(f"   ⚠️ Умеренная изоляция\n")
                     else:
-                        result_text += f"   ❌ Слабая изоляция (низкий WER)\n"
+                        parts.append(f"   ❌ Слабая изоляция (низкий WER)\n")
             
                     if comparison.get('leakage_detected', False):
-                        result_text += f"   ⚠️ ОБНАРУЖЕНА УТЕЧКА РЕЧИ!\n"
+                        parts.append(f"   ⚠️ ОБНАРУЖЕНА УТЕЧКА РЕЧИ!\n")
     
             # 4.5 Рекомендации (обновленные с учетом спуфинга)
-            result_text += "\n💡 РЕКОМЕНДАЦИИ:\n"
-            result_text += "-" * 40 + "\n"
+            section_lines.append(("section_recommendations", next_line(1)))
+            parts.append("\n💡 РЕКОМЕНДАЦИИ:\n")
+            parts.append("-" * 40 + "\n")
     
             # Добавляем рекомендации по спуфингу
             if spoofing_result_container:
                 spoofing_result = spoofing_result_container[0]
                 if spoofing_result.get('passed', False):
-                    result_text += "1. 🛡️ Спуфинг-атака НЕ обнаружена\n"
+                    parts.append("1. 🛡️ Спуфинг-атака НЕ обнаружена\n")
                 else:
-                    result_text += "1. ⚠️ ВОЗМОЖНА СПУФИНГ-АТАКА\n"
-                    result_text += "   • Проверьте источник звука\n"
-                    result_text += "   • Убедитесь в использовании живой речи\n"
-                    result_text += "   • Повторите тест с новой фразой\n"
+                    parts.append("1. ⚠️ ВОЗМОЖНА СПУФИНГ-АТАКА\n")
+                    parts.append("   • Проверьте источник звука\n")
+                    parts.append("   • Убедитесь в использовании живой речи\n")
+                    parts.append("   • Повторите тест с новой фразой\n")
         
             # Стандартные рекомендации по изоляции
             if isolation_assessment and 'isolation_metrics' in isolation_assessment:
@@ -1975,77 +3013,50 @@ class AdvancedSoundTester:
                     attenuation = iso_metrics['attenuation_db']
             
                     if attenuation < 30:
-                        result_text += "2. 🔧 Усилить изоляцию стен и перекрытий\n"
-                        result_text += "3. 🔧 Установить звукопоглощающие материалы\n"
-                        result_text += "4. 🔧 Проверить герметичность окон и дверей\n"
+                        parts.append("2. 🔧 Усилить изоляцию стен и перекрытий\n")
+                        parts.append("3. 🔧 Установить звукопоглощающие материалы\n")
+                        parts.append("4. 🔧 Проверить герметичность окон и дверей\n")
                     elif attenuation < 40:
-                        result_text += "2. ✅ Изоляция удовлетворительная\n"
-                        result_text += "3. 🔧 Рассмотреть дополнительную звукоизоляцию\n"
+                        parts.append("2. ✅ Изоляция удовлетворительная\n")
+                        parts.append("3. 🔧 Рассмотреть дополнительную звукоизоляцию\n")
                     else:
-                        result_text += "2. 🎉 Изоляция соответствует нормам\n"
-                        result_text += "3. ✅ Поддерживать текущее состояние\n"
+                        parts.append("2. 🎉 Изоляция соответствует нормам\n")
+                        parts.append("3. ✅ Поддерживать текущее состояние\n")
         
                 if 'words_lost' in iso_metrics:
                     lost_words = iso_metrics['words_lost']
                     if lost_words == 0:
-                        result_text += "4. 🎉 Идеальная изоляция речи!\n"
+                        parts.append("4. 🎉 Идеальная изоляция речи!\n")
                     elif lost_words < 3:
-                        result_text += "4. ✅ Хорошая изоляция речи\n"
+                        parts.append("4. ✅ Хорошая изоляция речи\n")
                     else:
-                        result_text += "4. ⚠️ Рекомендуется улучшить изоляцию речи\n"
+                        parts.append("4. ⚠️ Рекомендуется улучшить изоляцию речи\n")
     
-            result_text += "\n" + "=" * 70 + "\n"
-            result_text += "💡 Для точной аттестации:\n"
-            result_text += "   • Проведите 3-5 измерений\n"
-            result_text += "   • Используйте разные фразы\n"
-            result_text += "   • Учтите фоновый шум\n"
+            parts.append("\n" + "=" * 70 + "\n")
+            parts.append("💡 Для точной аттестации:\n")
+            parts.append("   • Проведите 3-5 измерений\n")
+            parts.append("   • Используйте разные фразы\n")
+            parts.append("   • Учтите фоновый шум\n")
         
             # Добавляем примечание о спуфинге
             if need_spoofing_check and spoofing_result_container:
                 spoofing_result = spoofing_result_container[0]
-                result_text += "\n🛡️ Защита от спуфинга:\n"
-                result_text += "   • Всегда используйте уникальные фразы\n"
-                result_text += "   • Проверяйте соответствие текста\n"
-                result_text += "   • Анализируйте технические показатели\n"
+                parts.append("\n🛡️ Защита от спуфинга:\n")
+                parts.append("   • Всегда используйте уникальные фразы\n")
+                parts.append("   • Проверяйте соответствие текста\n")
+                parts.append("   • Анализируйте технические показатели\n")
             
-            result_text += "=" * 70
+            parts.append("=" * 70)
+    
+            result_text = "".join(parts)
+    
+            # Жирный заголовок и цветные разделы: все диапазоны метки добавляются одним вызовом
+            tag_ranges = {"header": ["1.0", "1.end"]}
+            for tag, line in section_lines:
+                tag_ranges.setdefault(tag, []).extend(("%d.0" % line, "%d.end" % line))
     
             # Отображаем в интерфейсе
-            self.result_text.config(state=tk.NORMAL)
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, result_text)
-    
-            # Настраиваем форматирование
-            # Жирный заголовок
-            self.result_text.tag_add("header", "1.0", "1.end")
-            self.result_text.tag_config("header", font=('Arial', 12, 'bold'), foreground='darkblue')
-    
-            # Цветные разделы
-            import re
-            lines = result_text.split('\n')
-            for i, line in enumerate(lines, 1):
-                if "ПРОВЕРКА АУДИО" in line:
-                    self.result_text.tag_add(f"section{i}", f"{i}.0", f"{i}.end")
-                    color = "darkgreen"
-                    if spoofing_result_container:
-                        spoofing_result = spoofing_result_container[0]
-                        if not spoofing_result.get('passed', False):
-                            color = "darkred"
-                    self.result_text.tag_config(f"section{i}", font=('Arial', 11, 'bold'), foreground=color)
-                elif "РАСПОЗНАННЫЕ ТЕКСТЫ" in line:
-                    self.result_text.tag_add(f"section{i}", f"{i}.0", f"{i}.end")
-                    self.result_text.tag_config(f"section{i}", font=('Arial', 11, 'bold'), foreground='darkblue')
-                elif "ОЦЕНКА ЗВУКОИЗОЛЯЦИИ" in line:
-                    self.result_text.tag_add(f"section{i}", f"{i}.0", f"{i}.end")
-                    self.result_text.tag_config(f"section{i}", font=('Arial', 11, 'bold'), foreground='darkred')
-                elif "СРАВНИТЕЛЬНЫЕ МЕТРИКИ" in line:
-                    self.result_text.tag_add(f"section{i}", f"{i}.0", f"{i}.end")
-                    self.result_text.tag_config(f"section{i}", font=('Arial', 11, 'bold'), foreground='purple')
-                elif "РЕКОМЕНДАЦИИ" in line:
-                    self.result_text.tag_add(f"section{i}", f"{i}.0", f"{i}.end")
-                    self.result_text.tag_config(f"section{i}", font=('Arial', 11, 'bold'), foreground='darkorange')
-    
-            self.result_text.config(state=tk.DISABLED)
+            self._show_result_text(result_text, tag_ranges)
     
             # Показываем отдельное окно с результатом проверки спуфинга
             if spoofing_result_container:
@@ -2055,11 +3066,13 @@ class AdvancedSoundTester:
     
             self.status_var.set("✅ Распознавание завершено, оценка изоляции готова" + 
                                (" (проверка спуфинга выполнена)" if spoofing_result_container else ""))
+            
+            if on_done:
+                self.root.after(0, on_done)
     
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка распознавания: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Ошибка распознавания речи")
             self.status_var.set("❌ Ошибка распознавания")
     
     def delete_recording(self):
@@ -2072,7 +3085,7 @@ class AdvancedSoundTester:
             
             # Подтверждение
             item = self.recordings_tree.item(selection[0])
-            test_name = item['values'][0]
+            test_name = str(item['values'][0])  # ttk возвращает числовые имена ("101") как int
             
             confirm = messagebox.askyesno(
                 "Подтверждение удаления",
@@ -2083,22 +3096,45 @@ class AdvancedSoundTester:
             if not confirm:
                 return
             
-            # Удаляем файлы
+            # Удаляем файлы в фоне; итог показывается уже в потоке Tk
+            prefix = os.path.join(self.recordings_folder, test_name)
             files_to_delete = [
-                os.path.join(self.recordings_folder, f"{test_name}_outside.wav"),
-                os.path.join(self.recordings_folder, f"{test_name}_inside.wav"),
-                os.path.join(self.recordings_folder, f"{test_name}_metadata.json"),
-                os.path.join(self.recordings_folder, f"{test_name}_analysis.json")
+                f"{prefix}_outside.wav",
+                f"{prefix}_inside.wav",
+                f"{prefix}_metadata.json",
+                f"{prefix}_analysis.json"
             ]
             
-            deleted_count = 0
-            for filepath in files_to_delete:
-                if os.path.exists(filepath):
-                    try:
-                        os.remove(filepath)
-                        deleted_count += 1
-                    except Exception as e:
-                        print(f"Ошибка удаления {filepath}: {e}")
+            self._metadata_cache.pop(test_name, None)
+            for path in files_to_delete[2:]:
+                self._meta_cache.pop(path, None)
+            self._known_files.difference_update(os.path.basename(path) for path in files_to_delete)
+            self.status_var.set("🗑️ Удаление записи...")
+            future = self._io_executor.submit(self._delete_files, files_to_delete)
+            future.add_done_callback(lambda f: self._ui_queue.put((self._on_delete_done, (f,))))
+            
+        except Exception as e:
+            messagebox.showerror("Ошибка", f"Ошибка удаления: {e}")
+    
+    def _delete_files(self, files_to_delete):
+        """Удалить файлы записи (рабочий поток); возвращает число удаленных"""
+        deleted_count = 0
+        for filepath in files_to_delete:
+            # Без предварительной проверки exists: отсутствующий файл просто пропускаем
+            try:
+                os.remove(filepath)
+                deleted_count += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"Ошибка удаления {filepath}: {e}")
+        
+        return deleted_count
+    
+    def _on_delete_done(self, future):
+        """Завершение фонового удаления (поток Tk)"""
+        try:
+            deleted_count = future.result()
             
             # Обновляем список
             self.refresh_recordings_list()
@@ -2109,8 +3145,11 @@ class AdvancedSoundTester:
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка удаления: {e}")
     
-    def generate_report(self):
-        """Сгенерировать отчет по выбранной записи с данными распознавания"""
+    def generate_report(self, after_recognition=False):
+        """Сгенерировать отчет по выбранной записи с данными распознавания.
+        
+        after_recognition - повторный вызов по завершении распознавания (второй раз не спрашиваем).
+        """
         try:
             # 1. Проверяем, есть ли выбранная запись
             selection = self.recordings_tree.selection()
@@ -2120,24 +3159,22 @@ class AdvancedSoundTester:
     
             # 2. Получаем название теста
             item = self.recordings_tree.item(selection[0])
-            test_name = item['values'][0]
+            test_name = str(item['values'][0])  # ttk возвращает числовые имена ("101") как int
     
             # 3. Парсим данные ИЗ ТЕКСТА РЕЗУЛЬТАТОВ в интерфейсе
             report_data = self._parse_results_from_displayed_text(test_name)
     
             # 4. Если нет данных в интерфейсе, спрашиваем, распознать ли речь
-            if not report_data['has_speech_data']:
-                response = messagebox.askyesno(
+            if not report_data.has_speech_data:
+                response = not after_recognition and messagebox.askyesno(
                     "Нет данных распознавания",
                     "В результатах анализа нет данных распознавания речи.\n\n"
                     "Хотите сначала выполнить распознавание речи?"
                 )
             
                 if response:
-                    # Запускаем распознавание
-                    self.recognize_speech()
-                    # Ждем немного и пытаемся снова
-                    self.root.after(2000, lambda: self.generate_report())
+                    # Запускаем распознавание; отчет продолжится сразу по его завершении
+                    self.recognize_speech(on_done=lambda: self.generate_report(after_recognition=True))
                     return
                 else:
                     # Создаем отчет без данных распознавания
@@ -2148,182 +3185,147 @@ class AdvancedSoundTester:
     
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка генерации отчета: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Ошибка генерации отчета")
 
     def _parse_results_from_displayed_text(self, test_name):
         """Парсить данные распознавания из текста, отображаемого в интерфейсе"""
-        report_data = {
-            'test_name': test_name,
-            'has_speech_data': False,
-            'has_spoofing_data': False,
-            'has_analysis_data': False,
-            'speech_results': {},
-            'spoofing_results': {},
-            'analysis_results': {},
-            'parsed_sections': [],
-            'metadata': self._load_test_metadata(test_name)
-        }
+        report_data = ReportData(test_name, self._load_test_metadata(test_name))
 
         try:
-            # Получаем весь текст из поля результатов
-            result_text = self.result_text.get("1.0", tk.END)
+            # Строки последнего отчета; если его еще не было - читаем поле результатов
+            lines = self._last_result_lines
+            if lines is None:
+                lines = self.result_text.get("1.0", tk.END).split('\n')
 
-            if not result_text or result_text.strip() == "":
+            if not any(line.strip() for line in lines):
                 print("⚠️ Текст результатов пуст")
                 return report_data
 
-            # Разбиваем на строки для анализа
-            lines = result_text.split('\n')
-
             print(f"🔍 Анализирую {len(lines)} строк...")
 
-            # Проходим по всем строкам и ищем нужные данные
-            for i, line in enumerate(lines):
-                line = line.strip()
-
-                # ============ РАСПОЗНАННЫЕ ТЕКСТЫ И УВЕРЕННОСТЬ ============
-                if line == "📝 РАСПОЗНАННЫЕ ТЕКСТЫ:":
-                    report_data['parsed_sections'].append('speech')
-                    # Ищем следующие строки с данными
-                    j = i + 1
-                    while j < len(lines) and not lines[j].startswith("📊"):
-                        line_text = lines[j].strip()
-                    
-                        # Текст внутри помещения
-                        if "🎤 ВНУТРИ:" in line_text:
-                            # Ищем текст на следующей строке
-                            if j + 1 < len(lines):
-                                inside_line = lines[j + 1].strip()
-                                if inside_line and not inside_line.startswith("Уверенность:"):
-                                    # Убираем кавычки если есть
-                                    inside_text = inside_line.strip('"').strip()
-                                    if inside_text and inside_text != "❌ Не распознано":
-                                        report_data['speech_results']['inside_text'] = inside_text
-                                        report_data['has_speech_data'] = True
-                    
-                        # Уверенность внутри
-                        elif "Уверенность:" in line_text and j > 0 and "🎤 ВНУТРИ" in lines[j-1]:
-                            confidence = line_text.split(":")[1].strip()
-                            report_data['speech_results']['inside_confidence'] = confidence
-                            report_data['has_speech_data'] = True
-                    
-                        # Текст снаружи помещения
-                        elif "📡 СНАРУЖИ" in line_text:
-                            # Ищем текст на следующей строке
-                            if j + 1 < len(lines):
-                                outside_line = lines[j + 1].strip()
-                                if outside_line and not outside_line.startswith("Уверенность:"):
-                                    # Убираем кавычки если есть
-                                    outside_text = outside_line.strip('"').strip()
-                                    if outside_text and outside_text != "❌ Не распознано":
-                                        report_data['speech_results']['outside_text'] = outside_text
-                                        report_data['has_speech_data'] = True
-                    
-                        # Уверенность снаружи
-                        elif "Уверенность:" in line_text and j > 0 and "📡 СНАРУЖИ" in lines[j-1]:
-                            confidence = line_text.split(":")[1].strip()
-                            report_data['speech_results']['outside_confidence'] = confidence
-                            report_data['has_speech_data'] = True
-                    
-                        j += 1
-            
-                # ============ ПРОВЕРКА СПУФИНГА ============
-                elif line.startswith("🔍 ПРОВЕРКА АУДИО ВНУТРИ ПОМЕЩЕНИЯ:"):
-                    report_data['parsed_sections'].append('spoofing')
-                    j = i + 1
-                    while j < len(lines) and not lines[j].startswith("📝"):
-                        if "Совпадение с эталоном:" in lines[j]:
-                            match = lines[j].split(":")[1].strip()
-                            report_data['spoofing_results']['match_score'] = match
-                            report_data['has_spoofing_data'] = True
-                    
-                        elif "Порог прохождения:" in lines[j]:
-                            threshold = lines[j].split(":")[1].strip()
-                            report_data['spoofing_results']['threshold'] = threshold
-                    
-                        elif "Уверенность распознавания:" in lines[j]:
-                            confidence = lines[j].split(":")[1].strip()
-                            report_data['spoofing_results']['confidence'] = confidence
-                    
-                        elif "Эталонная фраза:" in lines[j]:
-                            # Берем текст в кавычках
-                            import re
-                            match = re.search(r'"(.*?)"', lines[j])
-                            if match:
-                                report_data['spoofing_results']['reference_text'] = match.group(1)
-                    
-                        elif "Распознанная фраза:" in lines[j]:
-                            # Берем текст в кавычках
-                            import re
-                            match = re.search(r'"(.*?)"', lines[j])
-                            if match:
-                                report_data['spoofing_results']['recognized_text'] = match.group(1)
-                    
-                        j += 1
-            
-                # ============ АНАЛИЗ ЗВУКОИЗОЛЯЦИИ ============
-                elif line.startswith("📊 ОЦЕНКА ЗВУКОИЗОЛЯЦИИ"):
-                    report_data['parsed_sections'].append('analysis')
-                    j = i + 1
-                    while j < len(lines) and not lines[j].startswith("📈"):
-                        if "Ослабление звука:" in lines[j]:
-                            # Ищем число с "дБ"
-                            import re
-                            match = re.search(r'(\d+\.?\d*)\s*дБ', lines[j])
-                            if match:
-                                report_data['analysis_results']['attenuation_db'] = match.group(1)
-                                report_data['has_analysis_data'] = True
-                    
-                        elif "Эффективность изоляции:" in lines[j]:
-                            # Ищем число с "%"
-                            import re
-                            match = re.search(r'(\d+\.?\d*)\s*%', lines[j])
-                            if match:
-                                report_data['analysis_results']['isolation_efficiency'] = match.group(1)
-                    
-                        elif "Всего слов в фразе:" in lines[j]:
-                            words = lines[j].split(":")[1].strip()
-                            report_data['analysis_results']['total_words'] = words
-                    
-                        elif "Слов потеряно при изоляции:" in lines[j]:
-                            lost = lines[j].split(":")[1].strip()
-                            report_data['analysis_results']['lost_words'] = lost
-                    
-                        j += 1
+            speech = report_data.speech
+            spoofing = report_data.spoofing
+            analysis = report_data.analysis
+            actor = None      # канал (inside/outside), к которому относятся строки раздела речи
+            pending = False   # текст канала стоит на следующей строке
+
+            # ============ РАСПОЗНАННЫЕ ТЕКСТЫ И УВЕРЕННОСТЬ ============
+            def speech_line(line):
+                nonlocal actor, pending
+                if pending:
+                    # Текст на строке после заголовка канала
+                    if line and not line.startswith("Уверенность:"):
+                        # Убираем кавычки если есть
+                        text = line.strip('"').strip()
+                        if text and text != "❌ Не распознано":
+                            setattr(speech, f"{actor}_text", text)
+                            report_data.has_speech_data = True
+                    pending = False
+
+                # Текст внутри / снаружи помещения
+                if "🎤 ВНУТРИ:" in line:
+                    actor, pending = 'inside', True
+                elif "📡 СНАРУЖИ" in line:
+                    actor, pending = 'outside', True
+                # Уверенность относится к последнему встреченному каналу
+                elif actor and line.startswith("Уверенность:"):
+                    setattr(speech, f"{actor}_confidence", line.split(":", 1)[1].strip())
+                    report_data.has_speech_data = True
+
+            # ============ ПРОВЕРКА СПУФИНГА ============
+            def spoofing_line(line):
+                if "Совпадение с эталоном:" in line:
+                    spoofing.match_score = line.split(":", 1)[1].strip()
+                    report_data.has_spoofing_data = True
+                elif "Порог прохождения:" in line:
+                    spoofing.threshold = line.split(":", 1)[1].strip()
+                elif "Уверенность распознавания:" in line:
+                    spoofing.confidence = line.split(":", 1)[1].strip()
+                elif "Эталонная фраза:" in line:
+                    # Берем текст в кавычках
+                    match = _QUOTED_RE.search(line)
+                    if match:
+                        spoofing.reference_text = match.group(1)
+                elif "Распознанная фраза:" in line:
+                    match = _QUOTED_RE.search(line)
+                    if match:
+                        spoofing.recognized_text = match.group(1)
+
+            # ============ АНАЛИЗ ЗВУКОИЗОЛЯЦИИ ============
+            def analysis_line(line):
+                if "Ослабление звука:" in line:
+                    # Ищем число с "дБ"
+                    match = _DB_RE.search(line)
+                    if match:
+                        analysis.attenuation_db = match.group(1)
+                        report_data.has_analysis_data = True
+                elif "Эффективность изоляции:" in line:
+                    # Ищем число с "%"
+                    match = _PCT_RE.search(line)
+                    if match:
+                        analysis.isolation_efficiency = match.group(1)
+                elif "Всего слов в фразе:" in line:
+                    analysis.total_words = line.split(":", 1)[1].strip()
+                elif "Слов потеряно при изоляции:" in line:
+                    analysis.lost_words = line.split(":", 1)[1].strip()
+
+            extractors = {'speech': speech_line, 'spoofing': spoofing_line, 'analysis': analysis_line}
+
+            # Один проход: заголовок переключает раздел, терминатор его закрывает.
+            # Строки обрезаются один раз, а большинство строк отсекает
+            # единственный вызов startswith с кортежем префиксов заголовков.
+            # Обрезка ленивая: после выхода из цикла оставшиеся строки не трогаем
+            stripped = (raw.strip() for raw in lines)
+            sections_left = {name for _, name in self.RESULT_SECTION_HEADERS}
+            state = None
+            for line in stripped:
+                header = None
+                if line.startswith(self.RESULT_SECTION_PREFIXES):
+                    header = next(name for prefix, name in self.RESULT_SECTION_HEADERS
+                                  if line.startswith(prefix))
+                if header:
+                    state = header
+                    actor, pending = None, False
+                    report_data.parsed_sections.append(header)
+                    sections_left.discard(header)
+                elif state and line.startswith(self.RESULT_SECTION_TERMINATORS[state]):
+                    state = None
+                    # Все разделы прочитаны и закрыты - дальше искать нечего
+                    if not sections_left:
+                        break
+                elif state:
+                    extractors[state](line)
         
             # ============ АЛЬТЕРНАТИВНЫЙ ПОИСК (регулярные выражения) ============
-            if not report_data['has_speech_data']:
-                # Пробуем найти через регулярные выражения
-                import re
-            
+            if not report_data.has_speech_data:
+                # Пробуем найти через регулярные выражения (по тексту целиком)
+                result_text = "\n".join(lines)
                 # Ищем текст внутри помещения
-                inside_match = re.search(r'🎤 ВНУТРИ:\s*\n\s*"([^"]+)"', result_text, re.IGNORECASE)
+                inside_match = _INSIDE_TEXT_RE.search(result_text)
                 if inside_match:
-                    report_data['speech_results']['inside_text'] = inside_match.group(1).strip()
-                    report_data['has_speech_data'] = True
+                    speech.inside_text = inside_match.group(1).strip()
+                    report_data.has_speech_data = True
             
                 # Ищем текст снаружи помещения
-                outside_match = re.search(r'📡 СНАРУЖИ.*?:\s*\n\s*"([^"]+)"', result_text, re.IGNORECASE | re.DOTALL)
+                outside_match = _OUTSIDE_TEXT_RE.search(result_text)
                 if outside_match:
-                    report_data['speech_results']['outside_text'] = outside_match.group(1).strip()
-                    report_data['has_speech_data'] = True
+                    speech.outside_text = outside_match.group(1).strip()
+                    report_data.has_speech_data = True
         
             # ============ ЛОГИРОВАНИЕ РЕЗУЛЬТАТОВ ПАРСИНГА ============
             print(f"📊 Результаты парсинга для {test_name}:")
-            print(f"  • Данные речи: {report_data['has_speech_data']}")
-            print(f"  • Данные спуфинга: {report_data['has_spoofing_data']}")
-            print(f"  • Данные анализа: {report_data['has_analysis_data']}")
-            print(f"  • Разделы: {report_data['parsed_sections']}")
+            print(f"  • Данные речи: {report_data.has_speech_data}")
+            print(f"  • Данные спуфинга: {report_data.has_spoofing_data}")
+            print(f"  • Данные анализа: {report_data.has_analysis_data}")
+            print(f"  • Разделы: {report_data.parsed_sections}")
         
-            if report_data['has_speech_data']:
-                print(f"  • Внутри: '{report_data['speech_results'].get('inside_text', 'Нет')}'")
-                print(f"  • Снаружи: '{report_data['speech_results'].get('outside_text', 'Нет')}'")
+            if report_data.has_speech_data:
+                print(f"  • Внутри: '{report_data.speech.inside_text or 'Нет'}'")
+                print(f"  • Снаружи: '{report_data.speech.outside_text or 'Нет'}'")
     
         except Exception as e:
             print(f"❌ Ошибка парсинга текста: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Ошибка парсинга текста результатов")
     
         return report_data
     
@@ -2331,17 +3333,7 @@ class AdvancedSoundTester:
         """Создать базовые данные отчета без распознавания"""
         metadata = self._load_test_metadata(test_name)
     
-        return {
-            'test_name': test_name,
-            'has_speech_data': False,
-            'has_spoofing_data': False,
-            'has_analysis_data': False,
-            'speech_results': {},
-            'spoofing_results': {},
-            'analysis_results': {},
-            'parsed_sections': ['basic'],
-            'metadata': metadata
-        }
+        return ReportData(test_name, metadata, parsed_sections=['basic'])
 
     def _create_report_file(self, test_name, format_type, report_data):
         """Создать файл отчета в указанном формате"""
@@ -2388,12 +3380,14 @@ class AdvancedSoundTester:
             if not filename:
                 return
         
-            # Загружаем метаданные из файла
-            metadata = self._load_test_metadata(test_name)
+            # Метаданные уже загружены вместе с данными отчета
+            metadata = report_data.metadata or self._load_test_metadata(test_name)
         
             # Создаем отчет в выбранном формате
             if format_type == "html":
                 self._create_html_report(metadata, filename, report_data)
+            elif format_type == "csv":
+                self._create_csv_report(metadata, filename, report_data)
         
             # Показываем результат
             messagebox.showinfo("Успех", f"Отчет сохранен:\n{filename}")
@@ -2409,23 +3403,23 @@ class AdvancedSoundTester:
             # Если передана строка (например, имя файла), загружаем метаданные
             metadata = self._load_test_metadata(metadata)
 
-        # Получаем данные из метаданных
-        test_name = metadata.get('test_name', 'Неизвестный тест') if isinstance(metadata, dict) else 'Неизвестный тест'
-        timestamp = metadata.get('timestamp', 'Нет данных') if isinstance(metadata, dict) else 'Нет данных'
-        duration = metadata.get('duration', 0) if isinstance(metadata, dict) else 0
-        sample_rate = metadata.get('sample_rate', 0) if isinstance(metadata, dict) else 0
-        reference_text = metadata.get('reference_text', 'Не задан') if isinstance(metadata, dict) else 'Не задан'
+        # Не словарь - в отчет идут одни значения по умолчанию
+        if not isinstance(metadata, dict):
+            metadata = _EMPTY
+        
+        # Время создания отчета - один раз на отчет
+        now_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # Используем report_data для заполнения данных распознавания
         speech_section = ""
-        if report_data['has_speech_data']:
-            speech_results = report_data['speech_results']
+        if report_data.has_speech_data:
+            speech_results = report_data.speech
         
             # Получаем тексты и уверенности
-            inside_text = speech_results.get('inside_text', 'Н/Д')
-            inside_confidence = speech_results.get('inside_confidence', 'Н/Д')
-            outside_text = speech_results.get('outside_text', 'Н/Д')
-            outside_confidence = speech_results.get('outside_confidence', 'Н/Д')
+            inside_text = speech_results.inside_text or 'Н/Д'
+            inside_confidence = speech_results.inside_confidence or 'Н/Д'
+            outside_text = speech_results.outside_text or 'Н/Д'
+            outside_confidence = speech_results.outside_confidence or 'Н/Д'
         
             # Форматируем для отображения
             inside_display = f'"{inside_text}"' if inside_text != 'Н/Д' else 'Н/Д'
@@ -2451,37 +3445,11 @@ class AdvancedSoundTester:
             </div>
             '''
         else:
-            speech_section = '''
-            <div class="info-card">
-                <h2>🎤 РЕЗУЛЬТАТЫ РАСПОЗНАВАНИЯ РЕЧИ</h2>
-                <table>
-                    <tr>
-                        <th>Параметр</th>
-                        <th>Значение</th>
-                    </tr>
-                    <tr>
-                        <td>Текст внутри помещения</td>
-                        <td>Н/Д (данные распознавания отсутствуют)</td>
-                    </tr>
-                    <tr>
-                        <td>Уверенность внутри</td>
-                        <td>Н/Д</td>
-                    </tr>
-                    <tr>
-                        <td>Текст снаружи помещения</td>
-                        <td>Н/Д</td>
-                    </tr>
-                    <tr>
-                        <td>Уверенность снаружи</td>
-                        <td>Н/Д</td>
-                    </tr>
-                </table>
-            </div>
-            '''
+            speech_section = _HTML_NO_SPEECH_SECTION
     
         spoofing_section = ""
-        if report_data['has_spoofing_data']:
-            spoofing_results = report_data['spoofing_results']
+        if report_data.has_spoofing_data:
+            spoofing_results = report_data.spoofing
             spoofing_section = f'''
             <div class="info-card">
                 <h2>🛡️ РЕЗУЛЬТАТЫ ПРОВЕРКИ СПУФИНГА</h2>
@@ -2492,23 +3460,23 @@ class AdvancedSoundTester:
                     </tr>
                     <tr>
                         <td>Совпадение с эталоном</td>
-                        <td>{spoofing_results.get('match_score', 'Н/Д')}</td>
+                        <td>{spoofing_results.match_score or 'Н/Д'}</td>
                     </tr>
                     <tr>
                         <td>Порог прохождения</td>
-                        <td>{spoofing_results.get('threshold', 'Н/Д')}</td>
+                        <td>{spoofing_results.threshold or 'Н/Д'}</td>
                     </tr>
                     <tr>
                         <td>Уверенность распознавания</td>
-                        <td>{spoofing_results.get('confidence', 'Н/Д')}</td>
+                        <td>{spoofing_results.confidence or 'Н/Д'}</td>
                     </tr>
                 </table>
             </div>
             '''
     
         analysis_section = ""
-        if report_data['has_analysis_data']:
-            analysis_results = report_data['analysis_results']
+        if report_data.has_analysis_data:
+            analysis_results = report_data.analysis
             analysis_section = f'''
             <div class="info-card">
                 <h2>📊 РЕЗУЛЬТАТЫ АНАЛИЗА ЗВУКОИЗОЛЯЦИИ</h2>
@@ -2519,362 +3487,68 @@ class AdvancedSoundTester:
                     </tr>
                     <tr>
                         <td>Ослабление звука</td>
-                        <td>{analysis_results.get('attenuation_db', 'Н/Д')} дБ</td>
+                        <td>{analysis_results.attenuation_db or 'Н/Д'} дБ</td>
                     </tr>
                     <tr>
                         <td>Эффективность изоляции</td>
-                        <td>{analysis_results.get('isolation_efficiency', 'Н/Д')}</td>
+                        <td>{analysis_results.isolation_efficiency or 'Н/Д'}</td>
                     </tr>
                     <tr>
                         <td>Всего слов в фразе</td>
-                        <td>{analysis_results.get('total_words', 'Н/Д')}</td>
+                        <td>{analysis_results.total_words or 'Н/Д'}</td>
                     </tr>
                     <tr>
                         <td>Слов потеряно при изоляции</td>
-                        <td>{analysis_results.get('lost_words', 'Н/Д')}</td>
+                        <td>{analysis_results.lost_words or 'Н/Д'}</td>
                     </tr>
                 </table>
             </div>
             '''
     
-        # Полный HTML
-        html_content = f'''<!DOCTYPE html>
-    <html lang="ru">
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>Отчет по тесту звукоизоляции - {test_name}</title>
-        <style>
-            /* Стили остаются без изменений */
-            @media print {{
-                @page {{
-                    margin: 2cm;
-                    size: A4;
-                }}
-                body {{
-                    font-size: 12pt;
-                }}
-                .page-break {{
-                    page-break-before: always;
-                }}
-                .no-print {{
-                    display: none;
-                }}
-            }}
-        
-            * {{
-                box-sizing: border-box;
-                margin: 0;
-                padding: 0;
-            }}
-        
-            body {{
-                font-family: 'Arial', sans-serif;
-                line-height: 1.6;
-                color: #333;
-                max-width: 210mm;
-                margin: 0 auto;
-                padding: 20mm;
-                background-color: #f9f9f9;
-            }}
-        
-            .header {{
-                text-align: center;
-                margin-bottom: 30px;
-                padding-bottom: 20px;
-                border-bottom: 3px solid #2c3e50;
-            }}
-        
-            .header h1 {{
-                color: #2c3e50;
-                font-size: 24pt;
-                margin-bottom: 10px;
-            }}
-        
-            .header .subtitle {{
-                color: #7f8c8d;
-                font-size: 14pt;
-            }}
-        
-            .info-card {{
-                background: white;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 20px 0;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                border-left: 5px solid #3498db;
-            }}
-        
-            .result-card {{
-                background: white;
-                border-radius: 8px;
-                padding: 20px;
-                margin: 20px 0;
-                box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                border-left: 5px solid #2ecc71;
-            }}
-        
-            .verdict-card {{
-                background: white;
-                border-radius: 8px;
-                padding: 30px;
-                margin: 30px 0;
-                box-shadow: 0 4px 15px rgba(0,0,0,0.1);
-                text-align: center;
-                border: 2px solid #e74c3c;
-            }}
-        
-            .verdict-card h2 {{
-                color: #e74c3c;
-                font-size: 20pt;
-                margin-bottom: 15px;
-            }}
-        
-            .metrics-grid {{
-                display: grid;
-                grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-                gap: 15px;
-                margin: 20px 0;
-            }}
-        
-            .metric-item {{
-                background: #f8f9fa;
-                padding: 15px;
-                border-radius: 6px;
-                text-align: center;
-                border: 1px solid #dee2e6;
-            }}
-        
-            .metric-value {{
-                font-size: 24pt;
-                font-weight: bold;
-                color: #2c3e50;
-                margin: 10px 0;
-            }}
-        
-            .metric-label {{
-                color: #6c757d;
-                font-size: 11pt;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }}
-        
-            h2 {{
-                color: #2c3e50;
-                margin: 25px 0 15px 0;
-                padding-bottom: 10px;
-                border-bottom: 2px solid #ecf0f1;
-                font-size: 18pt;
-            }}
-        
-            h3 {{
-                color: #34495e;
-                margin: 20px 0 10px 0;
-                font-size: 14pt;
-            }}
-        
-            table {{
-                width: 100%;
-                border-collapse: collapse;
-                margin: 15px 0;
-                font-size: 11pt;
-            }}
-        
-            table th {{
-                background: #2c3e50;
-                color: white;
-                padding: 12px;
-                text-align: left;
-                font-weight: bold;
-            }}
-        
-            table td {{
-                padding: 12px;
-                border-bottom: 1px solid #ddd;
-            }}
-        
-            table tr:nth-child(even) {{
-                background: #f8f9fa;
-            }}
-        
-            .recommendations {{
-                background: #fff3cd;
-                border-left: 5px solid #ffc107;
-                padding: 20px;
-                margin: 20px 0;
-                border-radius: 6px;
-            }}
-        
-            .recommendations ul {{
-                padding-left: 20px;
-                margin: 10px 0;
-            }}
-        
-            .recommendations li {{
-                margin: 8px 0;
-            }}
-        
-            .footer {{
-                margin-top: 40px;
-                padding-top: 20px;
-                border-top: 2px solid #ecf0f1;
-                text-align: center;
-                color: #7f8c8d;
-                font-size: 10pt;
-            }}
-        
-            .print-button {{
-                display: block;
-                width: 200px;
-                margin: 30px auto;
-                padding: 12px 24px;
-                background: #3498db;
-                color: white;
-                text-align: center;
-                text-decoration: none;
-                border-radius: 6px;
-                font-weight: bold;
-                cursor: pointer;
-                border: none;
-                font-size: 12pt;
-            }}
-        
-            .print-button:hover {{
-                background: #2980b9;
-            }}
-        
-            .badge {{
-                display: inline-block;
-                padding: 5px 10px;
-                border-radius: 20px;
-                font-size: 10pt;
-                font-weight: bold;
-                margin: 0 5px;
-            }}
-        
-            .badge-success {{
-                background: #d4edda;
-                color: #155724;
-            }}
-        
-            .badge-warning {{
-                background: #fff3cd;
-                color: #856404;
-            }}
-        
-            .badge-danger {{
-                background: #f8d7da;
-                color: #721c24;
-            }}
-        
-            .grade {{
-                font-size: 32pt;
-                font-weight: bold;
-                color: #2c3e50;
-                text-align: center;
-                margin: 20px 0;
-            }}
-        
-            .text-validation {{
-                background: #e8f4fd;
-                border-left: 5px solid #3498db;
-                padding: 20px;
-                margin: 20px 0;
-                border-radius: 6px;
-            }}
-        
-            .text-validation.success {{
-                background: #d4edda;
-                border-left: 5px solid #28a745;
-            }}
-        
-            .text-validation.warning {{
-                background: #fff3cd;
-                border-left: 5px solid #ffc107;
-            }}
-        
-            .text-validation.danger {{
-                background: #f8d7da;
-                border-left: 5px solid #dc3545;
-            }}
-        </style>
-    </head>
-    <body>
-        <div class="header">
-            <h1>📊 ОТЧЕТ ПО ТЕСТУ ЗВУКОИЗОЛЯЦИИ</h1>
-            <div class="subtitle">Защита от спуфинг-атак - Sound Isolation Tester v3.14</div>
-        </div>
-    
-        <div class="info-card">
-            <h2>📋 ИНФОРМАЦИЯ О ТЕСТЕ</h2>
-            <div class="metrics-grid">
-                <div class="metric-item">
-                    <div class="metric-label">Название теста</div>
-                    <div class="metric-value">{test_name}</div>
-                </div>
-                <div class="metric-item">
-                    <div class="metric-label">Дата и время</div>
-                    <div class="metric-value">{timestamp}</div>
-                </div>
-                <div class="metric-item">
-                    <div class="metric-label">Длительность</div>
-                    <div class="metric-value">{duration:.1f} сек</div>
-                </div>
-                <div class="metric-item">
-                    <div class="metric-label">Частота дискретизации</div>
-                    <div class="metric-value">{sample_rate} Гц</div>
-                </div>
-            </div>
-        </div>
-    
-        {speech_section}
-        {spoofing_section}
-        {analysis_section}
-    
-        <div class="info-card">
-            <h2>🔧 ТЕХНИЧЕСКИЕ ДАННЫЕ</h2>
-            <table>
-                <tr>
-                    <th>Параметр</th>
-                    <th>Значение</th>
-                </tr>
-                <tr>
-                    <td>Фраза для проверки</td>
-                    <td>"{reference_text}"</td>
-                </tr>
-                <tr>
-                    <td>Дата создания отчета</td>
-                    <td>{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</td>
-                </tr>
-                <tr>
-                    <td>Версия приложения</td>
-                    <td>Sound Isolation Tester v3.14</td>
-                </tr>
-            </table>
-        </div>
-    
-        <div class="footer">
-            <p>Отчет сгенерирован автоматически. Для печати нажмите Ctrl+P</p>
-            <p>Все данные конфиденциальны и предназначены только для академического использования</p>
-        </div>
-    
-        <button class="print-button no-print" onclick="window.print()">🖨️ Печать отчета</button>
-    
-        <script>
-            window.onload = function() {{
-                // Автоматическое открытие диалога печати (можно закомментировать если не нужно)
-                // setTimeout(() => {{ window.print(); }}, 1000);
-            }};
-        </script>
-    </body>
-    </html>'''
-    
-        # Сохраняем HTML файл
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        # Шаблоны статичны, подставляются только переменные поля: сначала вычисленные здесь,
+        # затем из метаданных, отсутствующие - из _HTML_REPORT_DEFAULTS
+        fields_map = ChainMap({
+            'created': now_str,
+            'sections': "".join((speech_section, spoofing_section, analysis_section)),
+        }, metadata, _HTML_REPORT_DEFAULTS)
+        fields_map['duration'] = f"{fields_map['duration']:.1f}"
+        # Стили уже закодированы в UTF-8 при импорте - кодируются только переменные части.
+        # Части пишутся в файл по очереди, без склейки всего отчета в памяти
+        with open(filename, 'wb') as f:
+            f.write(_HTML_HEAD.substitute(fields_map).encode('utf-8'))
+            f.write(_HTML_CSS_BYTES)
+            f.write(_HTML_BODY.substitute(fields_map).encode('utf-8'))
+            f.write(_HTML_FOOT_BYTES)
     
         print(f"✅ HTML отчет сохранен: {filename}")
     
+    def _create_csv_report(self, metadata, filename, report_data):
+        """Создать CSV отчет (раздел, параметр, значение)"""
+        rows = [
+            {'section': 'test', 'parameter': key, 'value': str(metadata.get(key, ''))}
+            for key in ('test_name', 'timestamp', 'duration', 'sample_rate', 'reference_text')
+        ]
+        
+        for section, values in report_data.sections():
+            for key, value in values.items():
+                rows.append({'section': section, 'parameter': key, 'value': str(value)})
+        
+        if POLARS_AVAILABLE:
+            # Polars пишет CSV в Rust-коде, без построчного цикла в Python
+            pl.DataFrame(rows, schema=['section', 'parameter', 'value']).write_csv(
+                filename, include_bom=True
+            )
+        else:
+            # Строки собираются в памяти и записываются в файл одним вызовом
+            buffer = io.StringIO(newline='')
+            writer = csv.DictWriter(buffer, fieldnames=['section', 'parameter', 'value'])
+            writer.writeheader()
+            writer.writerows(rows)
+            with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
+                f.write(buffer.getvalue())
+        
+        print(f"✅ CSV отчет сохранен: {filename}")
+    
     def play_recording(self):
         """Воспроизвести выбранную запись"""
         try:
@@ -2885,13 +3559,11 @@ class AdvancedSoundTester:
             
             # Получаем данные выбранной записи
             item = self.recordings_tree.item(selection[0])
-            test_name = item['values'][0]
+            test_name = str(item['values'][0])  # ttk возвращает числовые имена ("101") как int
             
-            # Находим файлы записи
-            outside_path = os.path.join(self.recordings_folder, f"{test_name}_outside.wav")
-            inside_path = os.path.join(self.recordings_folder, f"{test_name}_inside.wav")
-            
-            if not os.path.exists(outside_path) or not os.path.exists(inside_path):
+            # Наличие файлов - по последнему сканированию папки, без лишних stat
+            known = self._known_files
+            if f"{test_name}_outside.wav" not in known or f"{test_name}_inside.wav" not in known:
                 messagebox.showerror("Ошибка", "Файлы записи не найдены")
                 return
             
@@ -2903,24 +3575,17 @@ class AdvancedSoundTester:
                 type=messagebox.YESNOCANCEL
             )
             
-            if channel == messagebox.YES:
-                file_to_play = outside_path
-                channel_name = "СНАРУЖИ"
-            elif channel == messagebox.NO:
-                file_to_play = inside_path
-                channel_name = "ВНУТРИ"
-            else:
-                # Воспроизводим оба
-                file_to_play = None
-            
-            if file_to_play:
-                # Воспроизводим один файл
-                self._play_audio_file(file_to_play, channel_name)
-            else:
-                # Воспроизводим оба файла (последовательно)
-                self._play_audio_file(outside_path, "СНАРУЖИ")
-                time.sleep(1)
-                self._play_audio_file(inside_path, "ВНУТРИ")
+            # Файлы записи строятся от общего префикса; второй канал запускается
+            # через паузу таймером Tk, не блокируя интерфейс
+            prefix = os.path.join(self.recordings_folder, test_name)
+            channels = self.PLAYBACK_CHANNELS.get(channel, self.PLAYBACK_BOTH)
+            for i, (suffix, channel_name) in enumerate(channels):
+                filepath = f"{prefix}_{suffix}.wav"
+                if i == 0:
+                    self._play_audio_file(filepath, channel_name)
+                else:
+                    self.root.after(self.PLAYBACK_GAP_MS * i,
+                                    partial(self._play_audio_file, filepath, channel_name))
             
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка воспроизведения: {e}")
@@ -2928,17 +3593,7 @@ class AdvancedSoundTester:
     def _play_audio_file(self, filepath, channel_name):
         """Воспроизвести аудиофайл"""
         try:
-            # Проверяем платформу
-            if sys.platform == "win32":
-                # Windows
-                os.startfile(filepath)
-            elif sys.platform == "darwin":
-                # macOS
-                subprocess.call(["open", filepath])
-            else:
-                # Linux
-                subprocess.call(["xdg-open", filepath])
-            
+            _open_audio(filepath)
             self.status_var.set(f"🎵 Воспроизведение: {channel_name}")
             
         except Exception as e:
@@ -2968,18 +3623,23 @@ class AdvancedSoundTester:
                     else:
                         raise ValueError(f"Неизвестный движок: {engine_name}")
                 
-                # Устанавливаем движок
-                success = self.recognizer.set_engine(engine)
+                # Устанавливаем движок (не во время фонового анализа или распознавания)
+                if not self._try_lock_recognizer():
+                    return
+                try:
+                    success = self.recognizer.set_engine(engine)
+                    if success:
+                        # Обновляем анализатор
+                        self.analyzer.set_recognition_engine(engine_name)
+                finally:
+                    self._recognizer_lock.release()
+                
+                self.engine_status_var.set(_engine_label(engine_name, success))
                 
                 if success:
                     self.current_engine = engine
-                    self.engine_status_var.set(f"✅ Выбран: {engine_name}")
                     self.status_var.set(f"Движок установлен: {engine_name}")
-                    
-                    # Обновляем анализатор
-                    self.analyzer.set_recognition_engine(engine_name)
                 else:
-                    self.engine_status_var.set(f"❌ Ошибка загрузки: {engine_name}")
                     messagebox.showerror("Ошибка", f"Не удалось загрузить движок: {engine_name}")
             else:
                 messagebox.showwarning("Предупреждение", 
@@ -3007,26 +3667,12 @@ class AdvancedSoundTester:
             
             # Контент
             ttk.Label(info_window, text="📥 ЗАГРУЗКА МОДЕЛЕЙ", 
-                     font=('Arial', 12, 'bold')).pack(pady=10)
-            
-            info_text = """Для загрузки моделей выполните:
-
-1. Запустите скрипт download_models.py:
-   • Откройте командную строку/терминал
-   • Перейдите в папку с проектом
-   • Выполните: python download_models.py
-
-2. Или выполните вручную:
-   • pip install vosk whisper
-   • Загрузите модели Whisper:
-     https://github.com/openai/whisper
-   • Загрузите модели Vosk:
-     https://alphacephei.com/vosk/models"""
+                     style="Header.TLabel").pack(pady=10)
             
             text_widget = scrolledtext.ScrolledText(info_window, wrap=tk.WORD, 
                                                    width=60, height=12)
             text_widget.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
-            text_widget.insert(tk.END, info_text)
+            text_widget.insert(tk.END, self.DOWNLOAD_INFO_TEXT)
             text_widget.config(state=tk.DISABLED)
             
             def open_download_script():
@@ -3076,59 +3722,79 @@ class AdvancedSoundTester:
                     "Сначала выберите движок распознавания")
                 return
             
-            # Выполняем распознавание
+            # Выполняем распознавание (не во время фонового анализа или распознавания)
+            if not self._try_lock_recognizer():
+                return
             self.status_var.set("🧪 Тест распознавания...")
             
-            result = self.recognizer.transcribe(audio_path)
+            try:
+                result = self.recognizer.transcribe(audio_path)
+            finally:
+                self._recognizer_lock.release()
             
             # Отображаем результаты
             self.test_result_text.delete(1.0, tk.END)
             
             if result and result.text:
-                result_text = f"✅ РАСПОЗНАНО УСПЕШНО\n\n"
-                result_text += f"Движок: {result.engine}\n"
-                result_text += f"Текст: {result.text}\n"
-                result_text += f"Уверенность: {result.confidence:.2f}\n"
-                result_text += f"Время обработки: {result.processing_time:.1f} сек\n"
+                parts = [
+                    "✅ РАСПОЗНАНО УСПЕШНО\n\n",
+                    f"Движок: {result.engine}\n",
+                    f"Текст: {result.text}\n",
+                    f"Уверенность: {result.confidence:.2f}\n",
+                    f"Время обработки: {result.processing_time:.1f} сек\n",
+                ]
                 
                 if result.words:
-                    result_text += f"\nСлова: {len(result.words)}\n"
+                    parts.append(f"\nСлова: {len(result.words)}\n")
                     for i, word in enumerate(result.words[:10]):  # Показываем первые 10 слов
-                        result_text += f"  {i+1}. {word.get('word', '')}\n"
+                        parts.append(f"  {i+1}. {word.get('word', '')}\n")
                     if len(result.words) > 10:
-                        result_text += f"  ... и еще {len(result.words) - 10} слов\n"
+                        parts.append(f"  ... и еще {len(result.words) - 10} слов\n")
             else:
-                result_text = "❌ РАСПОЗНАНИЕ НЕ УДАЛОСЬ\n\n"
-                result_text += "Возможные причины:\n"
-                result_text += "1. Аудиофайл поврежден\n"
-                result_text += "2. В файле нет речи\n"
-                result_text += "3. Модель не загружена корректно\n"
-                result_text += "4. Неправильный формат файла\n"
-            
-            self.test_result_text.insert(tk.END, result_text)
+                parts = [
+                    "❌ РАСПОЗНАНИЕ НЕ УДАЛОСЬ\n\n",
+                    "Возможные причины:\n",
+                    "1. Аудиофайл поврежден\n",
+                    "2. В файле нет речи\n",
+                    "3. Модель не загружена корректно\n",
+                    "4. Неправильный формат файла\n",
+                ]
+            
+            self.test_result_text.insert(tk.END, "".join(parts))
             self.status_var.set("✅ Тест завершен")
             
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка теста распознавания: {e}")
     
     def load_config(self):
-        """Загрузить конфигурацию"""
+        """Загрузить конфигурацию (чтение файла в фоновом потоке)"""
+        threading.Thread(target=self._load_config_thread, daemon=True).start()
+    
+    def _load_config_thread(self):
+        """Поток чтения конфигурации"""
         try:
             config_file = "config.json"
-            if os.path.exists(config_file):
-                with open(config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                
-                # Восстанавливаем настройки
-                if 'last_engine' in config:
-                    # Пытаемся установить последний движок
-                    pass
-                
-                print("✅ Конфигурация загружена")
-                
+            try:
+                mtime = os.stat(config_file).st_mtime
+            except FileNotFoundError:
+                return
+            config = _read_config(config_file, mtime)
+            
+            # Применяем настройки в потоке Tk
+            self._ui_queue.put((self._apply_config, (config,)))
+            
         except Exception as e:
             print(f"⚠️ Ошибка загрузки конфигурации: {e}")
     
+    def _apply_config(self, config):
+        """Применить загруженную конфигурацию"""
+        # Восстанавливаем настройки
+        if 'last_engine' in config:
+            # Пытаемся установить последний движок
+            pass
+        
+        print("✅ Конфигурация загружена")
+    
     def save_config(self):
         """Сохранить конфигурацию"""
         try:
@@ -3138,8 +3804,8 @@ class AdvancedSoundTester:
                 'app_version': '3.14'
             }
             
-            with open("config.json", 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            with open("config.json", 'wb') as f:
+                f.write(_json_dumps(config))
             
             print("✅ Конфигурация сохранена")
             
@@ -3159,21 +3825,16 @@ class AdvancedSoundTester:
         scenarios_frame = ttk.LabelFrame(parent, text="📋 ПРЕДУСТАНОВЛЕННЫЕ СЦЕНАРИИ", padding="10")
         scenarios_frame.pack(fill=tk.X, pady=10)
     
+        # Строки сценариев размещаются сеткой прямо во фрейме, без отдельного фрейма на строку
         self.scenario_vars = []
-        scenarios = [
-            ("Тихая комната", "Низкий шум, хорошая акустика", True),
-            ("Офисное помещение", "Умеренный шум, разговоры на фоне", False),
-            ("Коридор с эхом", "Средний шум, реверберация", False),
-        ]
-    
-        for i, (name, desc, default) in enumerate(scenarios):
-            frame = ttk.Frame(scenarios_frame)
-            frame.pack(fill=tk.X, pady=2)
-        
+        for row, (name, desc, default) in enumerate(self.QUICK_SCENARIOS):
             var = tk.BooleanVar(value=default)
-            ttk.Checkbutton(frame, text=name, variable=var).pack(side=tk.LEFT, padx=5)
-            ttk.Label(frame, text=desc, foreground="gray").pack(side=tk.LEFT, padx=20)
+            ttk.Checkbutton(scenarios_frame, text=name, variable=var).grid(
+                row=row, column=0, sticky=tk.W, padx=5, pady=2)
+            ttk.Label(scenarios_frame, text=desc, foreground="gray").grid(
+                row=row, column=1, sticky=tk.W, padx=20, pady=2)
             self.scenario_vars.append((name, var))
+        scenarios_frame.columnconfigure(1, weight=1)
     
         # Параметры генерации
         params_frame = ttk.LabelFrame(parent, text="⚙️ ПАРАМЕТРЫ ГЕНЕРАЦИИ", padding="10")
@@ -3191,13 +3852,10 @@ class AdvancedSoundTester:
     
         params_frame.columnconfigure(1, weight=1)
     
-        # Кнопка генерации
-        btn_frame = ttk.Frame(parent)
-        btn_frame.pack(pady=20)
-    
-        ttk.Button(btn_frame, text="🚀 СГЕНЕРИРОВАТЬ ДАТАСЕТ", 
+        # Кнопка генерации (стиль Green.TButton зарегистрирован в setup_styles)
+        ttk.Button(parent, text="🚀 СГЕНЕРИРОВАТЬ ДАТАСЕТ", 
                 command=self.generate_quick_dataset, width=25,
-                style="Green.TButton").pack(pady=10)
+                style="Green.TButton").pack(pady=30)
     
         # Прогресс
         self.progress_var = tk.StringVar(value="Готов к генерации")
@@ -3217,16 +3875,11 @@ class AdvancedSoundTester:
         conditions_frame = ttk.LabelFrame(parent, text="📊 УСЛОВИЯ В ДАТАСЕТЕ", padding="10")
         conditions_frame.pack(fill=tk.X, pady=10)
     
-        conditions = [
-            ("1. Ideal Conditions", "Идеальные условия (эталон)", "Низкий шум, хорошая акустика"),
-            ("2. Quiet Office", "Тихий офис", "Умеренный шум, фоновая речь"),
-        ]
-    
-        for name, desc, params in conditions:
+        for name, desc, params in self.DIPLOMA_CONDITIONS:
             frame = ttk.Frame(conditions_frame)
             frame.pack(fill=tk.X, pady=3)
         
-            ttk.Label(frame, text=name, font=('Arial', 10, 'bold'), width=20).pack(side=tk.LEFT, padx=5)
+            ttk.Label(frame, text=name, style="Bold.TLabel", width=20).pack(side=tk.LEFT, padx=5)
             ttk.Label(frame, text=desc, width=25).pack(side=tk.LEFT, padx=5)
             ttk.Label(frame, text=params, foreground="green").pack(side=tk.LEFT, padx=5)
     
@@ -3234,28 +3887,16 @@ class AdvancedSoundTester:
         stats_frame = ttk.LabelFrame(parent, text="📈 СТАТИСТИКА ДАТАСЕТА", padding="10")
         stats_frame.pack(fill=tk.X, pady=10)
     
-        stats = [
-            ("Всего сэмплов:", "20 (2 условия × 10 сэмплов)"),
-            ("Длительность:", "3-6 секунд каждый"),
-            ("Частота дискретизации:", "16 кГц (стандарт для распознавания)"),
-            ("Общий объем:", "≈ 10-20 МБ"),
-            ("Форматы:", "WAV аудио + CSV (UTF-8) + JSON"),
-            ("Кодировка CSV:", "UTF-8-BOM (открывается в Excel)")
-        ]
-    
-        for label, value in stats:
+        for label, value in self.DIPLOMA_STATS:
             frame = ttk.Frame(stats_frame)
             frame.pack(fill=tk.X, pady=2)
-            ttk.Label(frame, text=label, font=('Arial', 9, 'bold'), width=25).pack(side=tk.LEFT)
+            ttk.Label(frame, text=label, style="SmallBold.TLabel", width=25).pack(side=tk.LEFT)
             ttk.Label(frame, text=value).pack(side=tk.LEFT)
     
-        # Кнопка генерации
-        btn_frame = ttk.Frame(parent)
-        btn_frame.pack(pady=20)
-    
-        ttk.Button(btn_frame, text="СГЕНЕРИРОВАТЬ ТЕСТОВЫЙ ДАТАСЕТ", 
+        # Кнопка генерации (стиль Green.TButton зарегистрирован в setup_styles)
+        ttk.Button(parent, text="СГЕНЕРИРОВАТЬ ТЕСТОВЫЙ ДАТАСЕТ", 
                 command=self.generate_diploma_dataset, width=30,
-                style="Green.TButton").pack()
+                style="Green.TButton").pack(pady=20)
 
     def generate_quick_dataset(self):
         """Быстрая генерация датасета"""
@@ -3275,47 +3916,12 @@ class AdvancedSoundTester:
             dataset_name = self.dataset_name_var.get()
         
             # Создаем условия на основе сценариев
-            from dataset_generator import AcousticCondition
-        
-            conditions = []
-            scenario_params = {
-                "Тихая комната": {
-                    'name': 'quiet_room',
-                    'noise': 0.02, 'reverb': 0.3, 'types': ['white'], 
-                    'room': (4, 5, 3), 'absorption': 0.8, 'distance': 1.0
-                },
-                "Офисное помещение": {
-                    'name': 'office',
-                    'noise': 0.08, 'reverb': 0.5, 'types': ['white', 'office'], 
-                    'room': (6, 8, 3), 'absorption': 0.6, 'distance': 1.5
-                },
-                "Коридор с эхом": {
-                    'name': 'corridor',
-                    'noise': 0.12, 'reverb': 1.2, 'types': ['pink'], 
-                    'room': (15, 3, 3), 'absorption': 0.3, 'distance': 2.0
-                },
-            }
         
-            for scenario in selected_scenarios:
-                if scenario in scenario_params:
-                    params = scenario_params[scenario]
-                    condition = AcousticCondition(
-                        name=params['name'],  # Английское название
-                        description=f"Сценарий: {scenario}",
-                        background_noise_level=params['noise'],
-                        reverberation_time=params['reverb'],
-                        noise_types=params['types'],
-                        speech_level_variation=0.2,
-                        speech_speed_variation=0.1,
-                        room_size=params['room'],
-                        absorption_coefficient=params['absorption'],
-                        distance_to_microphone=params['distance']
-                    )
-                    conditions.append(condition)
+            conditions = [_build_condition(scenario) for scenario in selected_scenarios
+                          if scenario in _SCENARIO_PARAMS]
         
             # Создаем генератор
-            from dataset_generator import TestDatasetGenerator
-            generator = TestDatasetGenerator(output_dir=dataset_name)
+            generator = _dataset_generator().TestDatasetGenerator(output_dir=dataset_name)
         
             # Запускаем в отдельном потоке с прогрессом
             self.progress_var.set("🔄 Начинаю генерацию датасета...")
@@ -3327,8 +3933,7 @@ class AdvancedSoundTester:
         
         except Exception as e:
             messagebox.showerror("Ошибка", f"Ошибка генерации: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Ошибка генерации датасета")
             self.progress_var.set("❌ Ошибка генерации")
 
     def generate_diploma_dataset(self):
@@ -3382,10 +3987,9 @@ class AdvancedSoundTester:
     def _generate_diploma_dataset_thread(self):
         """Поток генерации тестового датасета"""
         try:
-            from dataset_generator import create_diploma_dataset
         
             # Генерируем датасет
-            dataset_info = create_diploma_dataset()
+            dataset_info = _dataset_generator().create_diploma_dataset()
         
             self.root.after(0, lambda: self._dataset_generation_complete(
                 dataset_info, "тестовый"
@@ -3425,27 +4029,15 @@ class AdvancedSoundTester:
     def _calculate_text_match(self, recognized, reference):
         """Вычисление процента совпадения текста для проверки спуфинга"""
         try:
-            import difflib
-            import re
-        
             if not recognized or not reference:
                 return 0.0
         
             # Очищаем текст
-            def clean_text(text):
-                text = str(text).lower()
-                text = text.replace('ё', 'е')
-                # Удаляем знаки препинания и лишние пробелы
-                text = re.sub(r'[^\w\s]', '', text)
-                text = ' '.join(text.split())
-                return text
+            clean_rec = _normalize_text(recognized)
+            clean_ref = _normalize_text(reference)
         
-            clean_rec = clean_text(recognized)
-            clean_ref = clean_text(reference)
-        
-            # Используем SequenceMatcher для сравнения
-            matcher = difflib.SequenceMatcher(None, clean_rec, clean_ref)
-            similarity = matcher.ratio()
+            # Сходство строк (SequenceMatcher)
+            similarity = _text_ratio(clean_rec, clean_ref)
         
             # Дополнительная проверка по ключевым словам
             ref_words = set(clean_ref.split())
@@ -3464,6 +4056,52 @@ class AdvancedSoundTester:
             print(f"Ошибка сравнения текстов: {e}")
             return 0.0
 
+    def _show_progress_window(self, title, header, status):
+        """Показать модальное окно прогресса; возвращает (номер запуска, StringVar статуса)"""
+        if self._progress_window is None or not self._progress_window.winfo_exists():
+            window = tk.Toplevel(self.root)
+            window.withdraw()
+            window.transient(self.root)
+            
+            # Центрируем
+            x = (self.root.winfo_screenwidth() // 2) - (400 // 2)
+            y = (self.root.winfo_screenheight() // 2) - (200 // 2)
+            window.geometry(f'400x200+{x}+{y}')
+            
+            self._progress_header_var = tk.StringVar()
+            self._progress_status_var = tk.StringVar()
+            self._progress_done_var = tk.BooleanVar(value=False)
+            
+            ttk.Label(window, textvariable=self._progress_header_var,
+                     style="Header.TLabel").pack(pady=20)
+            ttk.Label(window, textvariable=self._progress_status_var).pack()
+            
+            # Закрытие окна пользователем прерывает ожидание
+            window.protocol("WM_DELETE_WINDOW", self._hide_progress_window)
+            self._progress_window = window
+        
+        self._progress_run += 1
+        self._progress_window.title(title)
+        self._progress_header_var.set(header)
+        self._progress_status_var.set(status)
+        self._progress_done_var.set(False)
+        
+        self._progress_window.deiconify()
+        self._progress_window.grab_set()
+        
+        return self._progress_run, self._progress_status_var
+    
+    def _hide_progress_window(self, run=None):
+        """Скрыть окно прогресса (run - номер запуска; завершение устаревшего запуска игнорируется)"""
+        if run is not None and run != self._progress_run:
+            return
+        
+        window = self._progress_window
+        if window is not None and window.winfo_exists():
+            window.grab_release()
+            window.withdraw()
+        self._progress_done_var.set(True)
+    
     def _show_detailed_spoofing_result(self, spoofing_result, test_name):
         """Показать детальные результаты проверки спуфинга в отдельном окне"""
         try:
@@ -3486,7 +4124,7 @@ class AdvancedSoundTester:
                 title_color = "red"
             
             ttk.Label(result_window, text=title_text, 
-                     font=('Arial', 14, 'bold'), foreground=title_color).pack(pady=10)
+                     style="Title.TLabel", foreground=title_color).pack(pady=10)
         
             # Информация о тесте
             info_frame = ttk.LabelFrame(result_window, text="📋 ИНФОРМАЦИЯ", padding="10")
@@ -3515,7 +4153,7 @@ class AdvancedSoundTester:
             progress_bar.pack(fill=tk.X, pady=5)
             progress_bar['value'] = min(match_percent, 100)
         
-            # Цвет прогресс бара
+            # Цвет прогресс бара (стили зарегистрированы в setup_styles)
             if match_percent >= 80:
                 style_name = "green.Horizontal.TProgressbar"
             elif match_percent >= 60:
@@ -3523,15 +4161,6 @@ class AdvancedSoundTester:
             else:
                 style_name = "red.Horizontal.TProgressbar"
         
-            # Создаем стили для цветных прогресс баров
-            style = ttk.Style()
-            style.configure("green.Horizontal.TProgressbar", 
-                           background='green', troughcolor='lightgray')
-            style.configure("yellow.Horizontal.TProgressbar", 
-                           background='orange', troughcolor='lightgray')
-            style.configure("red.Horizontal.TProgressbar", 
-                           background='red', troughcolor='lightgray')
-        
             progress_bar.configure(style=style_name)
         
             # Дополнительные метрики
@@ -3546,7 +4175,7 @@ class AdvancedSoundTester:
         
             # Эталонная фраза
             ttk.Label(phrases_frame, text="Эталонная фраза:", 
-                     font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(0, 5))
+                     style="Bold.TLabel").pack(anchor=tk.W, pady=(0, 5))
         
             ref_frame = ttk.Frame(phrases_frame)
             ref_frame.pack(fill=tk.X, pady=(0, 10))
@@ -3558,7 +4187,7 @@ class AdvancedSoundTester:
         
             # Распознанная фраза
             ttk.Label(phrases_frame, text="Распознанная фраза:", 
-                     font=('Arial', 10, 'bold')).pack(anchor=tk.W, pady=(0, 5))
+                     style="Bold.TLabel").pack(anchor=tk.W, pady=(0, 5))
         
             rec_frame = ttk.Frame(phrases_frame)
             rec_frame.pack(fill=tk.BOTH, expand=True)
@@ -3650,49 +4279,41 @@ class AdvancedSoundTester:
     
         # Заголовок
         ttk.Label(format_window, text="📄 ВЫБЕРИТЕ ФОРМАТ ОТЧЕТА", 
-                 font=('Arial', 12, 'bold')).pack(pady=10)
+                 style="Header.TLabel").pack(pady=10)
     
         # Информация о доступных данных
         info_frame = ttk.LabelFrame(format_window, text="📊 ДОСТУПНЫЕ ДАННЫЕ", padding="10")
         info_frame.pack(fill=tk.X, padx=20, pady=10)
     
-        info_text = f"Тест: {test_name}\n\n"
+        parts = [f"Тест: {test_name}\n\n"]
     
-        if report_data['has_speech_data']:
-            info_text += "✅ Данные распознавания речи\n"
-            inside_text = report_data['speech_results'].get('inside_text', '')
+        if report_data.has_speech_data:
+            parts.append("✅ Данные распознавания речи\n")
+            inside_text = report_data.speech.inside_text
             if inside_text:
-                if len(inside_text) > 40:
-                    info_text += f"   • Внутри: \"{inside_text[:40]}...\"\n"
-                else:
-                    info_text += f"   • Внутри: \"{inside_text}\"\n"
+                parts.append(f"   • Внутри: \"{_clip(inside_text, 40)}\"\n")
         
-            outside_text = report_data['speech_results'].get('outside_text', '')
+            outside_text = report_data.speech.outside_text
             if outside_text:
-                if len(outside_text) > 40:
-                    info_text += f"   • Снаружи: \"{outside_text[:40]}...\"\n"
-                else:
-                    info_text += f"   • Снаружи: \"{outside_text}\"\n"
+                parts.append(f"   • Снаружи: \"{_clip(outside_text, 40)}\"\n")
     
-        if report_data['has_spoofing_data']:
-            info_text += "✅ Данные проверки спуфинга\n"
-            if 'match_score' in report_data['spoofing_results']:
-                info_text += f"   • Совпадение: {report_data['spoofing_results']['match_score']}\n"
+        if report_data.has_spoofing_data:
+            parts.append("✅ Данные проверки спуфинга\n")
+            if report_data.spoofing.match_score is not None:
+                parts.append(f"   • Совпадение: {report_data.spoofing.match_score}\n")
     
-        if report_data['has_analysis_data']:
-            info_text += "✅ Данные анализа звукоизоляции\n"
-            if 'attenuation_db' in report_data['analysis_results']:
-                info_text += f"   • Ослабление: {report_data['analysis_results']['attenuation_db']} дБ\n"
-            if 'isolation_efficiency' in report_data['analysis_results']:
-                info_text += f"   • Эффективность: {report_data['analysis_results']['isolation_efficiency']}\n"
+        if report_data.has_analysis_data:
+            parts.append("✅ Данные анализа звукоизоляции\n")
+            if report_data.analysis.attenuation_db is not None:
+                parts.append(f"   • Ослабление: {report_data.analysis.attenuation_db} дБ\n")
+            if report_data.analysis.isolation_efficiency is not None:
+                parts.append(f"   • Эффективность: {report_data.analysis.isolation_efficiency}\n")
     
-        if not any([report_data['has_speech_data'], 
-                    report_data['has_spoofing_data'], 
-                    report_data['has_analysis_data']]):
-            info_text += "⚠️ Только базовые метаданные\n"
-            info_text += "Сначала выполните 'Распознать речь'\n"
+        if not report_data.has_any_data:
+            parts.append("⚠️ Только базовые метаданные\n")
+            parts.append("Сначала выполните 'Распознать речь'\n")
     
-        ttk.Label(info_frame, text=info_text, justify=tk.LEFT).pack()
+        ttk.Label(info_frame, text="".join(parts), justify=tk.LEFT).pack()
     
         # Выбор формата
         format_var = tk.StringVar(value="html")
@@ -3702,6 +4323,7 @@ class AdvancedSoundTester:
     
         formats = [
             ("📄 HTML - красивый, для печати", "html"),
+            ("📊 CSV - таблица для Excel", "csv"),
         ]
     
         for text, value in formats:
@@ -3710,9 +4332,7 @@ class AdvancedSoundTester:
     
         # Кнопка создания
         def create_report():
-            if not any([report_data['has_speech_data'], 
-                        report_data['has_spoofing_data'], 
-                        report_data['has_analysis_data']]):
+            if not report_data.has_any_data:
                 messagebox.showwarning("Нет данных", 
                     "Сначала выполните анализ или распознавание речи")
                 format_window.destroy()
@@ -3728,13 +4348,25 @@ class AdvancedSoundTester:
               command=format_window.destroy).pack()
 
     def _load_test_metadata(self, test_name):
-        """Загрузить метаданные теста"""
+        """Загрузить метаданные теста (прочитанный файл запоминается по имени теста и mtime)"""
         metadata_path = os.path.join(self.recordings_folder, f"{test_name}_metadata.json")
         
-        if os.path.exists(metadata_path):
+        try:
+            mtime = os.stat(metadata_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        
+        if mtime is not None:
+            # Повторная запись под тем же именем меняет mtime файла - тогда читаем заново
+            cached = self._metadata_cache.get(test_name)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+            
             try:
                 with open(metadata_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                    metadata = json.load(f)
+                self._metadata_cache[test_name] = (mtime, metadata)
+                return metadata
             except:
                 pass
         
@@ -3751,7 +4383,11 @@ class AdvancedSoundTester:
         """Обработчик закрытия окна"""
         try:
             # Останавливаем мониторинг
-            self.monitoring_active = False
+            self._monitoring_evt.clear()
+            
+            # Фоновые операции больше не принимаются
+            self._io_executor.shutdown(wait=False)
+            self._analysis_executor.shutdown(wait=False)
             
             # Сохраняем конфигурацию
             self.save_config()
@@ -3769,9 +4405,16 @@ class AdvancedSoundTester:
 
     
 
+def setup_logging(filename="sound_tester.log"):
+    """Журнал приложения: трассировки ошибок пишутся в файл с ротацией, а не в консоль"""
+    handler = RotatingFileHandler(filename, maxBytes=1024 * 1024, backupCount=3, encoding='utf-8')
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
+
 def main():
     """Главная функция"""
     try:
+        setup_logging()
         root = tk.Tk()
         app = AdvancedSoundTester(root)
         
@@ -3781,7 +4424,6 @@ def main():
         root.mainloop()
         
     except Exception as e:
-        import traceback
         error_msg = f"Критическая ошибка запуска:\n\n{str(e)}\n\n"
         error_msg += "Трассировка:\n"
         error_msg += traceback.format_exc()
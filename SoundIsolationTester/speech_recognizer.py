@@ -111,6 +111,12 @@ class MultiEngineSpeechRecognizer:
     def set_engine(self, engine: RecognitionEngine):
         """Установка текущего движка распознавания"""
         try:
+            # Модель уже загружалась - переключаемся без повторного чтения весов с диска
+            if engine in self.engines:
+                self.current_engine = engine
+                print(f"✅ Движок уже загружен: {engine.value}")
+                return True
+            
             print(f"⚙️ Загрузка движка: {engine.value}")
             
             if engine.value.startswith('whisper'):